@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Asset Cache
+Logos drawn on every letter (NICLOGO, isphere, MauCAS, ZwennPay) are opened and
+measured once per process. Canvases draw them by file name, which reportlab
+embeds as the original JPEG stream without decoding it; an ImageReader would be
+decoded to RGB and hashed on every drawImage call.
+"""
+
+import os
+
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader
+
+
+class ImageAsset:
+    """A logo's path and pixel size; getSize() matches ImageReader"""
+
+    __slots__ = ('path', 'width', 'height')
+
+    def __init__(self, path):
+        self.path = path
+        self.width, self.height = ImageReader(path).getSize()
+
+    def getSize(self):
+        return self.width, self.height
+
+
+_assets = {}
+
+
+def image(path):
+    """Return the shared ImageAsset for an image file (measured on first use)"""
+    key = os.path.abspath(path)
+    asset = _assets.get(key)
+    if asset is None:
+        asset = _assets[key] = ImageAsset(key)
+    return asset
+
+
+def draw_image(c, path, x, y, width, height):
+    """c.drawImage() a logo file with its JPEG stream embedded as binary instead of ASCII85 text.
+
+    The pure-Python ASCII85 encoder was most of the per-letter image cost and
+    inflated each logo by 25%. rl_config.useA85 is process-wide, so it is only
+    switched off while reportlab reads the image.
+    """
+    use_a85 = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        c.drawImage(path, x, y, width=width, height=height)
+    finally:
+        rl_config.useA85 = use_a85
@@ -1,6 +1,7 @@
-import pandas as pd
 import os
 
+from listing_cache import load_listing
+
 backend_file = r'C:\Users\Ryan EZ\OneDrive - EZ DASH LTD\Documents\letters_Motors_health\backend\RENEWAL_LISTING.xlsx'
 
 print(f"Checking backend file: {backend_file}")
@@ -10,7 +11,7 @@ if os.path.exists(backend_file):
     print(f"File size: {os.path.getsize(backend_file)} bytes")
     
     try:
-        df = pd.read_excel(backend_file)
+        df, _ = load_listing(backend_file)
         print(f"Total rows read: {len(df)}")
         
         if 'POL_NO' in df.columns:
@@ -42,7 +43,7 @@ if os.path.exists(uploads_file):
     print(f"File size: {os.path.getsize(uploads_file)} bytes")
     
     try:
-        df2 = pd.read_excel(uploads_file)
+        df2, _ = load_listing(uploads_file)
         print(f"Total rows read: {len(df2)}")
         
         if 'POL_NO' in df2.columns:
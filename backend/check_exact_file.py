@@ -1,6 +1,7 @@
-import pandas as pd
 import os
 
+from listing_cache import load_listing
+
 file_path = r'C:\Users\Ryan EZ\OneDrive - EZ DASH LTD\Documents\letters_Motors_health\backend\uploads\health\RENEWAL_LISTING.xlsx'
 
 print(f"Checking file: {file_path}")
@@ -10,7 +11,7 @@ if os.path.exists(file_path):
     print(f"File size: {os.path.getsize(file_path)} bytes")
     
     try:
-        df = pd.read_excel(file_path)
+        df, _ = load_listing(file_path)
         print(f"Total rows read: {len(df)}")
         
         if 'POL_NO' in df.columns:
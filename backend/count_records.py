@@ -1,11 +1,12 @@
 
-import pandas as pd
 import sys
 import traceback
 
+from listing_summary import load_summary
+
 try:
-    df = pd.read_excel('output_motor_renewal.xlsx')
-    count = len(df)
+    summary = load_summary('output_motor_renewal.xlsx')
+    count = summary['rows']
     print(f"SUCCESS:{count}")
 except Exception as e:
     print(f"ERROR:{str(e)}")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Cover End Date Resolution
+Parses a whole 'Cover End Dt' column at once: detects the column's date format,
+parses only the distinct values and broadcasts the expiry / renewal start /
+renewal end display strings back to every row
+"""
+
+from datetime import timedelta
+
+import pandas as pd
+
+# Accepted Cover End Dt formats (a value can only ever match one of them)
+COVER_END_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',  # 2025-12-03 23:59:00
+    '%Y-%m-%d %H:%M',     # 2025-12-03 23:59
+    '%Y-%m-%d',           # 2025-12-03
+    '%d/%m/%Y %H:%M:%S',  # 03/12/2025 23:59:00
+    '%d/%m/%Y %H:%M',     # 03/12/2025 23:59
+    '%d/%m/%Y',           # 03/12/2025
+    '%d-%m-%Y %H:%M:%S',  # 03-12-2025 23:59:00
+    '%d-%m-%Y %H:%M',     # 03-12-2025 23:59
+    '%d-%m-%Y',           # 03-12-2025
+    '%d %B %Y',           # 03 December 2025
+    '%d %b %Y'            # 03 Dec 2025
+]
+
+DISPLAY_FORMAT = '%d-%B-%Y'
+DETECTION_SAMPLE_SIZE = 50
+
+
+def parse_with_format(values, date_format):
+    """Parse a Series of strings with one format; unparseable values become NaT"""
+    return pd.to_datetime(values, format=date_format, errors='coerce')
+
+
+def detect_date_format(values, formats=COVER_END_FORMATS):
+    """Return the format that parses the most values of a sample, or None"""
+    sample = pd.Series(values[:DETECTION_SAMPLE_SIZE], dtype=object)
+    best_format, best_hits = None, 0
+    for date_format in formats:
+        hits = int(parse_with_format(sample, date_format).notna().sum())
+        if hits > best_hits:
+            best_format, best_hits = date_format, hits
+            if hits == len(sample):
+                break
+    return best_format
+
+
+def resolve_cover_dates(cover_end):
+    """Resolve a column of cleaned Cover End Dt strings.
+
+    Returns (dates, report). dates is a DataFrame aligned with cover_end holding
+    expiry_date, renewal_start and renewal_end display strings plus a 'parsed'
+    flag. report lists (index, value) for every non-blank value that no format
+    could parse.
+    """
+    unique_values = pd.Series(cover_end[cover_end != ''].unique(), dtype=object)
+
+    # Detect the column format once, then try the other formats only on leftovers
+    detected = detect_date_format(unique_values.tolist())
+    formats = ([detected] if detected else []) + [f for f in COVER_END_FORMATS if f != detected]
+
+    parsed = pd.Series(pd.NaT, index=unique_values.index, dtype='datetime64[ns]')
+    for date_format in formats:
+        pending = parsed.isna()
+        if not pending.any():
+            break
+        parsed[pending] = parse_with_format(unique_values[pending], date_format)
+
+    # Format each distinct date once
+    ok = parsed.notna()
+    cover_end_dates = parsed[ok]
+    renewal_start_dates = cover_end_dates + timedelta(days=1)  # next day after cover end
+    renewal_end_dates = renewal_start_dates + timedelta(days=364)  # 1 day less than 1 year
+    lookup = pd.DataFrame({
+        'expiry_date': cover_end_dates.dt.strftime(DISPLAY_FORMAT),
+        'renewal_start': renewal_start_dates.dt.strftime(DISPLAY_FORMAT),
+        'renewal_end': renewal_end_dates.dt.strftime(DISPLAY_FORMAT),
+    })
+    lookup.index = unique_values[ok].values
+
+    # Broadcast back to every row
+    dates = pd.DataFrame(index=cover_end.index)
+    for column in lookup.columns:
+        dates[column] = cover_end.map(lookup[column]).astype(object)
+    dates['parsed'] = cover_end.isin(lookup.index)
+
+    unparseable = (cover_end != '') & ~dates['parsed']
+    report = list(cover_end[unparseable].items())
+    return dates, report
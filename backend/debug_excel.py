@@ -1,11 +1,12 @@
-import pandas as pd
 import os
 
+from listing_cache import load_listing
+
 file_path = 'uploads/health/RENEWAL_LISTING.xlsx'
 print(f"Analyzing file: {file_path}")
 print(f"File size: {os.path.getsize(file_path)} bytes")
 
-df = pd.read_excel(file_path)
+df, _ = load_listing(file_path)
 print(f"Total rows read by pandas: {len(df)}")
 print(f"Columns: {list(df.columns)}")
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+EMVCo Merchant QR
+Builds the EMVCo merchant-presented QR string that GetMerchantQR returns, locally
+from the request payload: TLV-encoded fields closed by a CRC16 (tag 63).
+
+The merchant's static part (account information, category, currency, name,
+city) is learned from a response already in the QR cache; the per-letter part -
+additional data (tag 62) with bill number, mobile, customer label and purpose -
+is encoded from the payload. A merchant is only built locally once the
+verification mode has reproduced its cached API responses byte for byte.
+
+Environment:
+  QR_MODE=local   build QR strings locally for verified merchants (default: api)
+
+Usage: python emvco_qr.py --verify [--merchant 155]
+"""
+
+import os
+import sys
+
+import qr_cache
+
+QR_MODE = os.environ.get('QR_MODE', 'api').lower()
+MIN_VERIFIED_SAMPLES = 3  # cached responses that must match before a merchant is trusted
+
+CRC_TAG = '63'
+AMOUNT_TAG = '54'
+TIP_INDICATOR_TAG = '55'
+TIP_FIXED_TAG = '56'
+TIP_PERCENTAGE_TAG = '57'
+ADDITIONAL_DATA_TAG = '62'
+DYNAMIC_TAGS = (AMOUNT_TAG, TIP_INDICATOR_TAG, TIP_FIXED_TAG, TIP_PERCENTAGE_TAG, ADDITIONAL_DATA_TAG, CRC_TAG)
+
+# Tag 62 sub-fields and the payload names that fill them
+ADDITIONAL_FIELDS = (
+    ('01', 'BillNumber'),
+    ('02', 'MobileNo'),
+    ('03', 'StoreLabel'),
+    ('04', 'LoyaltyNumber'),
+    ('05', 'ReferenceLabel'),
+    ('06', 'CustomerLabel'),
+    ('07', 'TerminalLabel'),
+    ('08', 'PurposeTransaction'),
+)
+REQUIRED_VALUE = '***'  # asks the paying app to prompt the customer
+
+
+def crc16(data):
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) as 4 upper-case hex digits"""
+    crc = 0xFFFF
+    for byte in data.encode('utf-8'):
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+            crc &= 0xFFFF
+    return f"{crc:04X}"
+
+
+def tlv(tag, value):
+    """Encode one field as ID + two-digit length + value"""
+    value = str(value)
+    if len(value) > 99:
+        raise ValueError(f"EMVCo field {tag} is longer than 99 characters")
+    return f"{tag}{len(value):02d}{value}"
+
+
+def parse_tlv(data):
+    """Split a TLV string into a list of (tag, value) pairs"""
+    fields = []
+    pos = 0
+    while pos < len(data):
+        if pos + 4 > len(data):
+            raise ValueError(f"Truncated EMVCo field at offset {pos}")
+        tag, length = data[pos:pos + 2], int(data[pos + 2:pos + 4])
+        value = data[pos + 4:pos + 4 + length]
+        if len(value) != length:
+            raise ValueError(f"EMVCo field {tag} at offset {pos} is truncated")
+        fields.append((tag, value))
+        pos += 4 + length
+    return fields
+
+
+def format_amount(value):
+    """EMVCo amount: plain decimal with at most two decimals"""
+    return f"{float(value):.2f}".rstrip('0').rstrip('.')
+
+
+def dynamic_fields(payload):
+    """Return the (tag, value) pairs a payload contributes"""
+    fields = []
+    if payload.get('SetTransactionAmount'):
+        fields.append((AMOUNT_TAG, format_amount(payload.get('TransactionAmount', 0))))
+    if payload.get('SetConvenienceIndicatorTip'):
+        fields.append((TIP_INDICATOR_TAG, '01'))
+    elif payload.get('SetConvenienceFeeFixed'):
+        fields.append((TIP_INDICATOR_TAG, '02'))
+        fields.append((TIP_FIXED_TAG, format_amount(payload.get('ConvenienceFeeFixed', 0))))
+    elif payload.get('SetConvenienceFeePercentage'):
+        fields.append((TIP_INDICATOR_TAG, '03'))
+        fields.append((TIP_PERCENTAGE_TAG, format_amount(payload.get('ConvenienceFeePercentage', 0))))
+
+    additional = []
+    for sub_tag, name in ADDITIONAL_FIELDS:
+        if not payload.get('SetAdditional' + name):
+            continue
+        if payload.get('AdditionalRequired' + name):
+            additional.append(tlv(sub_tag, REQUIRED_VALUE))
+        elif str(payload.get('Additional' + name, '')):
+            additional.append(tlv(sub_tag, payload['Additional' + name]))
+    if additional:
+        fields.append((ADDITIONAL_DATA_TAG, ''.join(additional)))
+    return fields
+
+
+def learn_template(qr_data):
+    """Return the static (tag, value) fields of an API response"""
+    return [[tag, value] for tag, value in parse_tlv(qr_data) if tag not in DYNAMIC_TAGS]
+
+
+def build_qr_string(payload, template):
+    """Assemble the full QR string for a payload on a merchant template"""
+    fields = [tuple(field) for field in template]
+    for tag, value in dynamic_fields(payload):
+        # Dynamic fields go in ID order between the static ones
+        position = next((i for i, (static_tag, _) in enumerate(fields) if static_tag > tag), len(fields))
+        fields.insert(position, (tag, value))
+    body = ''.join(tlv(tag, value) for tag, value in fields) + CRC_TAG + '04'
+    return body + crc16(body)
+
+
+_templates = {}
+
+
+def verified_template(merchant_id):
+    """Return the template of a verified merchant (looked up once per process), or None"""
+    if merchant_id not in _templates:
+        cache = qr_cache.get_cache()
+        stored = cache.get_template(merchant_id) if cache is not None else None
+        _templates[merchant_id] = stored['template'] if stored and stored['verified'] else None
+    return _templates[merchant_id]
+
+
+def local_qr(payload):
+    """Build the QR string locally when QR_MODE=local and the merchant is verified, else None"""
+    if QR_MODE != 'local':
+        return None
+    template = verified_template(payload.get('MerchantId'))
+    if template is None:
+        return None
+    try:
+        return build_qr_string(payload, template)
+    except ValueError:
+        return None
+
+
+def first_difference(a, b):
+    """Offset of the first differing character of two strings"""
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+def verify_merchant(cache, merchant_id, entries):
+    """Compare local builds against cached API responses for one merchant and store the result"""
+    template = None
+    matches = 0
+    mismatches = []
+    for payload, qr_data in entries:
+        try:
+            if template is None:
+                template = learn_template(qr_data)
+            built = build_qr_string(payload, template)
+        except ValueError as e:
+            mismatches.append((payload, qr_data, str(e)))
+            continue
+        if built == qr_data:
+            matches += 1
+        else:
+            offset = first_difference(built, qr_data)
+            mismatches.append((payload, qr_data, f"differs at offset {offset}: local {built[offset:offset + 12]!r} vs API {qr_data[offset:offset + 12]!r}"))
+
+    verified = template is not None and not mismatches and matches >= MIN_VERIFIED_SAMPLES
+    if template is not None:
+        cache.put_template(merchant_id, template, matches, len(mismatches), verified)
+    return verified, matches, mismatches
+
+
+def verify_cache(merchant_id=None):
+    """Verify every merchant (or one) found in the QR cache; return True when all pass"""
+    cache = qr_cache.get_cache()
+    if cache is None:
+        print("❌ QR cache is disabled, nothing to verify against")
+        return False
+
+    by_merchant = {}
+    for payload, qr_data in cache.entries(merchant_id):
+        by_merchant.setdefault(payload.get('MerchantId'), []).append((payload, qr_data))
+    if not by_merchant:
+        print("⚠️ No cached QR responses to verify against")
+        return False
+
+    all_verified = True
+    for merchant, entries in sorted(by_merchant.items(), key=lambda item: str(item[0])):
+        verified, matches, mismatches = verify_merchant(cache, merchant, entries)
+        status = "✅ verified" if verified else "❌ not verified"
+        print(f"{status}: merchant {merchant} - {matches}/{len(entries)} cached responses reproduced byte for byte")
+        if not verified and not mismatches:
+            print(f"   Need at least {MIN_VERIFIED_SAMPLES} matching responses")
+        for payload, qr_data, reason in mismatches[:5]:
+            print(f"   Bill {payload.get('AdditionalBillNumber', '')}: {reason}")
+        all_verified = all_verified and verified
+    return all_verified
+
+
+if __name__ == "__main__":
+    if '--verify' not in sys.argv:
+        print("Usage: python emvco_qr.py --verify [--merchant 155]")
+        sys.exit(1)
+
+    merchant = None
+    if '--merchant' in sys.argv and sys.argv.index('--merchant') + 1 < len(sys.argv):
+        merchant = int(sys.argv[sys.argv.index('--merchant') + 1])
+
+    sys.exit(0 if verify_cache(merchant) else 1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Font Registry
+Registers the Cambria faces with reportlab once per process. The parsed
+TrueType tables are kept in a serialized cache (backend/font_cache/), so a fresh
+generator process unpickles the metrics instead of parsing the TTF files again.
+The cache is keyed by font file size/mtime and the reportlab version and is
+rebuilt automatically when either changes.
+
+Usage: python font_registry.py --benchmark [repeats]
+"""
+
+import os
+import pickle
+import sys
+import time
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'font_cache')
+CACHE_VERSION = 1  # Bump when the cache layout changes
+
+CAMBRIA_REGULAR_PATH = os.path.join(FONT_DIR, 'cambria.ttf')
+CAMBRIA_BOLD_PATH = os.path.join(FONT_DIR, 'cambriab.ttf')
+CAMBRIA_FONTS = (('Cambria', CAMBRIA_REGULAR_PATH), ('Cambria-Bold', CAMBRIA_BOLD_PATH))
+
+
+class _PdfScale:
+    """Glyph units to PDF units (the parser stores a lambda, which cannot be pickled)"""
+
+    def __init__(self, units_per_em):
+        self.factor = 1000 / units_per_em
+
+    def __call__(self, x):
+        return x * self.factor
+
+
+def cache_path(name, path):
+    stat = os.stat(path)
+    key = f"{name}-{stat.st_size}-{stat.st_mtime_ns}-rl{reportlab.Version}-v{CACHE_VERSION}"
+    return os.path.join(CACHE_DIR, key + '.pickle')
+
+
+def parse_font(name, path):
+    """Parse a TTF file the normal way"""
+    return TTFont(name, path)
+
+
+def write_font_cache(font, target):
+    """Serialize a parsed font's state next to the other cached fonts"""
+    face_state = {k: v for k, v in vars(font.face).items() if k != '_pdfScale'}
+    font_state = {k: v for k, v in vars(font).items() if k not in ('face', 'state')}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(target + '.tmp', 'wb') as f:
+        pickle.dump({'font': font_state, 'face': face_state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(target + '.tmp', target)
+
+
+def read_font_cache(target):
+    """Rebuild a TTFont from its cached state"""
+    with open(target, 'rb') as f:
+        cached = pickle.load(f)
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(cached['face'])
+    face._pdfScale = _PdfScale(face.unitsPerEm)
+    font = TTFont.__new__(TTFont)
+    font.__dict__.update(cached['font'])
+    font.face = face
+    font.state = WeakKeyDictionary()
+    return font
+
+
+def load_font(name, path):
+    """Return a TTFont for path, from the serialized cache when possible"""
+    target = cache_path(name, path)
+    if os.path.exists(target):
+        try:
+            return read_font_cache(target)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable font cache {target}: {str(e)}")
+    font = parse_font(name, path)
+    try:
+        write_font_cache(font, target)
+    except Exception as e:
+        print(f"⚠️ Could not write font cache: {str(e)}")
+    return font
+
+
+def register_font(name, path):
+    """Register one font with reportlab unless this process already did"""
+    if name in pdfmetrics.getRegisteredFontNames():
+        return
+    pdfmetrics.registerFont(load_font(name, path))
+
+
+def register_cambria():
+    """Register Cambria and Cambria-Bold"""
+    for name, path in CAMBRIA_FONTS:
+        register_font(name, path)
+
+
+def benchmark(repeats=5):
+    """Time parsing the Cambria faces against loading them from the font cache"""
+    for name, path in CAMBRIA_FONTS:
+        load_font(name, path)  # Make sure the cache exists
+    results = {}
+    for label, loader in (('parse', parse_font), ('cache', lambda n, p: read_font_cache(cache_path(n, p)))):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for name, path in CAMBRIA_FONTS:
+                loader(name, path)
+        results[label] = (time.perf_counter() - started) * 1000 / repeats
+    print(f"🔤 Cambria startup: parse {results['parse']:.1f} ms, font cache {results['cache']:.1f} ms "
+          f"(mean of {repeats})")
+    return results
+
+
+if __name__ == "__main__":
+    if '--benchmark' not in sys.argv:
+        print("Usage: python font_registry.py --benchmark [repeats]")
+        sys.exit(1)
+
+    index = sys.argv.index('--benchmark')
+    repeats = int(sys.argv[index + 1]) if index + 1 < len(sys.argv) else 5
+    benchmark(repeats)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Letter API
+Renders single letters into memory instead of an output folder:
+render_motor_letter() and render_health_letter() return the finished PDF as
+bytes, so callers can merge, zip, attach or email letters without a disk
+round-trip, and concurrent runs share no output directory.
+
+    from letter_api import render_health_letter
+    pdf_bytes = render_health_letter(row)
+
+The QR code is fetched inline (through the QR cache) unless a prefetched
+call from qr_prefetch is passed as qr_fetch. Logos are read from the working
+directory, as in the generator scripts.
+"""
+
+import io
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+import font_registry
+import health_letter
+import motor_layout
+import motor_qr
+
+
+def render_to_bytes(draw, *args):
+    """Run draw(canvas, *args) on an in-memory canvas and return the PDF bytes"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    draw(c, *args)
+    c.save()
+    return buffer.getvalue()
+
+
+def render_motor_letter(record, qr_fetch=None, variant='standard'):
+    """PDF bytes of one motor renewal letter for a MotorRecord (see motor_records.py).
+
+    variant is 'standard' or 'letterhead', as for --variants of the motor script.
+    """
+    font_registry.register_cambria()
+    if variant == 'letterhead':
+        payload = motor_qr.build_letterhead_qr_payload(record)
+    else:
+        payload = motor_qr.build_qr_payload(record)
+    qr_code = motor_qr.fetch_qr_code(record, payload, qr_fetch)
+    return render_to_bytes(motor_layout.render, record, qr_code, variant)
+
+
+def render_health_letter(row, qr_fetch=None):
+    """PDF bytes of one healthcare renewal letter for a listing row (dict or pandas row).
+
+    Raises ValueError for rows without a policy number or name.
+    """
+    font_registry.register_cambria()
+    letter = health_letter.letter_fields(row)
+    if not letter['pol_no'] or not letter['name']:
+        raise ValueError("Missing essential data (POL_NO, NAME)")
+    qr_code = health_letter.fetch_qr_code(letter, health_letter.qr_payload(letter), qr_fetch)
+    return render_to_bytes(health_letter.draw_health_letter, letter, qr_code)
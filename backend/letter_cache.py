@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Letter Cache
+Content-addressed store of rendered letters. A letter's key is the SHA-256 of its
+normalized row fields, the template fingerprint (generator source and the
+images/fonts it draws) and the QR request (endpoint and payload), so a re-uploaded
+listing only re-renders the rows that actually changed, and letters carrying QR
+codes from a stub endpoint are never reused for production. Set LETTER_CACHE=0
+to disable.
+"""
+
+import hashlib
+import json
+import math
+import numbers
+import os
+import shutil
+import time
+from datetime import date, datetime
+
+import pandas as pd
+
+import qr_cache
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'letter_cache')
+ENABLED = os.environ.get('LETTER_CACHE', '1') != '0'
+MAX_AGE_DAYS = 30  # Letters not reused for this long are pruned
+
+_fingerprints = {}
+
+
+def template_fingerprint(*paths):
+    """Return a hash of the files that shape a letter (computed once per process)"""
+    if paths not in _fingerprints:
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(os.path.basename(path).encode('utf-8'))
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            else:
+                digest.update(b'<missing>')
+        _fingerprints[paths] = digest.hexdigest()
+    return _fingerprints[paths]
+
+
+def normalize_value(value):
+    """Return one listing cell as a string that does not depend on how it was read"""
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        number = float(value)
+        return str(int(number)) if number.is_integer() else repr(number)
+    return str(value).strip()
+
+
+def normalized_fields(row):
+    """Normalize a raw listing row so workbook, stream and sidecar reads hash the same"""
+    return {str(column): normalize_value(value) for column, value in row.items()}
+
+
+def letter_key(kind, fields, qr_payload, template, qr_endpoint=qr_cache.QR_ENDPOINT):
+    """Return the cache key for one letter"""
+    content = json.dumps(
+        {'kind': kind, 'template': template, 'fields': fields,
+         'qr': {'endpoint': qr_endpoint, 'payload': qr_payload}},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def cached_letter_path(kind, key):
+    return os.path.join(CACHE_DIR, kind, key[:2], key + '.pdf')
+
+
+def has_letter(kind, key):
+    """True when a letter with this key is cached"""
+    return ENABLED and os.path.exists(cached_letter_path(kind, key))
+
+
+def restore_letter(kind, key, pdf_filename):
+    """Copy a cached letter to pdf_filename; return False on a cache miss"""
+    if not ENABLED:
+        return False
+    cached_path = cached_letter_path(kind, key)
+    if not os.path.exists(cached_path):
+        return False
+    shutil.copyfile(cached_path, pdf_filename)
+    os.utime(cached_path)  # Mark as recently used so pruning keeps it
+    return True
+
+
+def store_letter(kind, key, pdf_filename):
+    """Add a freshly rendered letter to the cache"""
+    if not ENABLED:
+        return
+    cached_path = cached_letter_path(kind, key)
+    try:
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        shutil.copyfile(pdf_filename, cached_path + '.tmp')
+        os.replace(cached_path + '.tmp', cached_path)
+    except OSError as e:
+        print(f"⚠️ Could not cache letter {pdf_filename}: {str(e)}")
+
+
+def prune_letters(kind, max_age_days=MAX_AGE_DAYS):
+    """Remove cached letters of one kind that have not been used for max_age_days"""
+    kind_dir = os.path.join(CACHE_DIR, kind)
+    if not os.path.isdir(kind_dir):
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for root, _, files in os.walk(kind_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+    return removed
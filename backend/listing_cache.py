@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Listing Ingest Cache
+Parses an uploaded listing workbook once and stores a normalized Parquet sidecar
+keyed by the file's SHA-256. Later steps (count, generators, diagnostics) load the
+sidecar in milliseconds; a changed file has a new hash, so stale sidecars are
+never read.
+
+Usage: python listing_cache.py <workbook.xlsx> [--sheet Sheet1]
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import pandas as pd
+
+from listing_reader import open_listing, pick_sheet_name
+
+try:
+    import pyarrow  # noqa: F401 - required by pandas for Parquet
+    import pyarrow.parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'listing_cache')
+MAX_SIDECARS = 20  # Oldest sidecars beyond this are removed
+STREAM_BATCH_ROWS = 2000  # Rows decoded at a time when a sidecar is streamed
+# Files written next to each Parquet sidecar (see listing_summary.py for the last one)
+SIDECAR_SUFFIXES = ('.parquet', '.json', '.summary.json')
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sidecar_paths(digest, preferred_sheet=None):
+    """Return (parquet_path, info_path) for a workbook hash and sheet preference"""
+    base = os.path.join(CACHE_DIR, f"{digest}_{preferred_sheet or 'first'}")
+    return base + '.parquet', base + '.json'
+
+
+def make_parquet_safe(df):
+    """Convert object columns that Arrow cannot store (mixed types) to strings"""
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        try:
+            pyarrow.array(df[column], from_pandas=True)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            df[column] = df[column].map(lambda v: v if pd.isna(v) else str(v))
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def parse_workbook(path, preferred_sheet=None):
+    """Parse the listing sheet with pandas and return (df, info)"""
+    excel_file = pd.ExcelFile(path)
+    sheet_name = pick_sheet_name(excel_file.sheet_names, preferred_sheet)
+    df = excel_file.parse(sheet_name)
+    info = {
+        'sheet_names': list(excel_file.sheet_names),
+        'sheet_name': sheet_name,
+        'columns': [str(c) for c in df.columns],
+        'rows': len(df),
+    }
+    return df, info
+
+
+def prune_sidecars():
+    """Keep only the most recent MAX_SIDECARS sidecars"""
+    parquet_files = sorted(
+        (os.path.join(CACHE_DIR, f) for f in os.listdir(CACHE_DIR) if f.endswith('.parquet')),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    for parquet_file in parquet_files[MAX_SIDECARS:]:
+        base = parquet_file[:-len('.parquet')]
+        for stale in (base + suffix for suffix in SIDECAR_SUFFIXES):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+
+def write_sidecar(df, info, digest, preferred_sheet=None):
+    """Write the Parquet sidecar and its info file atomically"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    parquet_path, info_path = sidecar_paths(digest, preferred_sheet)
+    make_parquet_safe(df).to_parquet(parquet_path + '.tmp', index=False)
+    os.replace(parquet_path + '.tmp', parquet_path)
+    with open(info_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(dict(info, sha256=digest), f)
+    os.replace(info_path + '.tmp', info_path)
+    prune_sidecars()
+
+
+def read_sidecar(digest, preferred_sheet=None):
+    """Return (df, info) from an existing sidecar, or None"""
+    parquet_path, info_path = sidecar_paths(digest, preferred_sheet)
+    if not (PARQUET_AVAILABLE and os.path.exists(parquet_path) and os.path.exists(info_path)):
+        return None
+    try:
+        with open(info_path, encoding='utf-8') as f:
+            info = json.load(f)
+        return pd.read_parquet(parquet_path), info
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable listing sidecar {parquet_path}: {str(e)}")
+        return None
+
+
+def load_listing(path, preferred_sheet=None, digest=None):
+    """Return (df, info) for a listing, from its sidecar when the content hash matches.
+
+    On a cache miss the workbook is parsed and the sidecar written for next time.
+    preferred_sheet=None reads the first sheet, like pd.read_excel. Pass digest
+    when the caller has already hashed the file.
+    """
+    digest = digest or file_sha256(path)
+    cached = read_sidecar(digest, preferred_sheet)
+    if cached is not None:
+        return cached
+
+    df, info = parse_workbook(path, preferred_sheet)
+    info['sha256'] = digest
+    if PARQUET_AVAILABLE:
+        try:
+            write_sidecar(df, info, digest, preferred_sheet)
+        except Exception as e:
+            print(f"⚠️ Could not write listing sidecar: {str(e)}")
+    return df, info
+
+
+def open_cached_listing(path, preferred_sheet='Sheet1'):
+    """Like listing_reader.open_listing, but streams rows from the sidecar when one exists.
+
+    The sidecar is decoded STREAM_BATCH_ROWS rows at a time, so memory stays flat and
+    the first row is available without loading the whole file.
+    """
+    parquet_path, info_path = sidecar_paths(file_sha256(path), preferred_sheet)
+    if not (PARQUET_AVAILABLE and os.path.exists(parquet_path) and os.path.exists(info_path)):
+        return open_listing(path, preferred_sheet)
+    try:
+        with open(info_path, encoding='utf-8') as f:
+            info = json.load(f)
+        parquet_file = pyarrow.parquet.ParquetFile(parquet_path)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable listing sidecar {parquet_path}: {str(e)}")
+        return open_listing(path, preferred_sheet)
+
+    columns = [str(c) for c in parquet_file.schema_arrow.names]
+    row_count = parquet_file.metadata.num_rows
+    info = {
+        'sheet_names': info['sheet_names'],
+        'sheet_name': info['sheet_name'],
+        'columns': columns,
+        'estimated_rows': row_count,
+        'has_rows': row_count > 0,
+        'from_cache': True,
+    }
+
+    def rows():
+        for batch in parquet_file.iter_batches(batch_size=STREAM_BATCH_ROWS):
+            # Same conversion as pd.read_parquet, one batch at a time
+            for values in batch.to_pandas().itertuples(index=False, name=None):
+                yield {
+                    column: (float('nan') if value is None else value)
+                    for column, value in zip(columns, values)
+                }
+
+    return info, rows()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python listing_cache.py <workbook.xlsx> [--sheet Sheet1]")
+        sys.exit(1)
+
+    workbook_path = sys.argv[1]
+    sheet = None
+    if '--sheet' in sys.argv and sys.argv.index('--sheet') + 1 < len(sys.argv):
+        sheet = sys.argv[sys.argv.index('--sheet') + 1]
+
+    try:
+        listing_df, listing_info = load_listing(workbook_path, sheet)
+        print(f"Sheet: {listing_info['sheet_name']} (available: {listing_info['sheet_names']})")
+        print(f"SUCCESS:{len(listing_df)}")
+    except Exception as e:
+        print(f"ERROR:{str(e)}")
+        sys.exit(1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Renewal Listing Reader
+Streams rows out of renewal listing workbooks with a read-only openpyxl workbook,
+and CSV/TSV exports in fixed-size chunks, so large listings never have to be
+loaded into memory as a whole
+"""
+
+import itertools
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# Delimited export extensions and their separators
+DELIMITED_EXTENSIONS = {'.csv': ',', '.tsv': '\t', '.txt': '\t'}
+CHUNK_ROWS = 5000  # Rows per chunk when reading delimited exports
+
+
+def pick_sheet_name(sheet_names, preferred_sheet='Sheet1'):
+    """Return the preferred sheet if the workbook has it, otherwise the first sheet"""
+    if preferred_sheet and preferred_sheet in sheet_names:
+        return preferred_sheet
+    return sheet_names[0]
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _is_empty_row(values):
+    # pandas only treats a row as empty when every cell is empty
+    return all(value is None for value in values)
+
+
+def open_listing(path, preferred_sheet='Sheet1'):
+    """Open a listing workbook and return (info, rows).
+
+    info holds the sheet names, the sheet being read, its columns and an estimated
+    row count taken from the sheet dimensions. rows is a generator of
+    {column: value} dicts, one per data row (blank rows after the last data row
+    are dropped). Empty cells come back as NaN so each row behaves like the
+    pandas row it replaces.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    sheet_name = pick_sheet_name(workbook.sheetnames, preferred_sheet)
+    worksheet = workbook[sheet_name]
+    values_iter = worksheet.iter_rows(values_only=True)
+
+    header = next(values_iter, None) or ()
+    columns = [str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+
+    # Peek at the first data row so callers can bail out on an empty sheet
+    first_values = None
+    leading_blank = 0
+    for values in values_iter:
+        if not _is_empty_row(values):
+            first_values = values
+            break
+        leading_blank += 1
+
+    info = {
+        'sheet_names': list(workbook.sheetnames),
+        'sheet_name': sheet_name,
+        'columns': columns,
+        'estimated_rows': max((worksheet.max_row or 1) - 1, 0),
+        'has_rows': first_values is not None,
+    }
+
+    def to_row(values):
+        row = {}
+        for i, column in enumerate(columns):
+            value = values[i] if i < len(values) else None
+            row[column] = float('nan') if _is_blank(value) else value
+        return row
+
+    if first_values is None:
+        workbook.close()
+
+    def rows():
+        if first_values is None:
+            return
+        try:
+            # Blank rows between data rows come back as empty rows, like pandas,
+            # so row numbers match the listing summary; trailing blank rows are dropped
+            pending_blank = leading_blank
+            for values in itertools.chain([first_values], values_iter):
+                if _is_empty_row(values):
+                    pending_blank += 1
+                    continue
+                for _ in range(pending_blank):
+                    yield to_row(())
+                pending_blank = 0
+                yield to_row(values)
+        finally:
+            workbook.close()
+
+    return info, rows()
+
+
+def is_delimited_listing(path):
+    """True when the listing is a CSV/TSV export rather than a workbook"""
+    return os.path.splitext(path)[1].lower() in DELIMITED_EXTENSIONS
+
+
+def read_listing_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Return an iterator of DataFrames of at most chunk_rows rows from a CSV/TSV export.
+
+    Every column is read as text (blank cells as NaN) so values such as policy
+    and mobile numbers keep their exact spelling and chunks never disagree on
+    column types.
+    """
+    separator = DELIMITED_EXTENSIONS[os.path.splitext(path)[1].lower()]
+    return pd.read_csv(
+        path,
+        sep=separator,
+        dtype=str,
+        chunksize=chunk_rows,
+        encoding='utf-8-sig',  # Core-system exports may start with a BOM
+        skip_blank_lines=True,
+    )
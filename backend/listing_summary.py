@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Listing Summary
+Computes every count the upload checks need - rows, valid policy numbers,
+per-column nulls, premium validity, date parseability and the rows the
+generators will reject - in one parse of the listing and stores them as JSON
+next to the listing's Parquet sidecar. The upload routes and the diagnostic
+scripts read this summary instead of the workbook; row values (policy numbers,
+names) are read from the sidecar with listing_keys_and_names().
+
+Usage: python listing_summary.py <workbook.xlsx> [--sheet Sheet1]
+"""
+
+import json
+import os
+import sys
+
+import pandas as pd
+
+from cover_dates import resolve_cover_dates
+from listing_cache import CACHE_DIR, file_sha256, load_listing, sidecar_paths
+from motor_records import build_motor_records
+from validation import classify_health_frame, classify_motor_records, text_values
+
+SUMMARY_VERSION = 3  # Bump when the summary layout changes
+
+# Key, name, premium and date columns for each listing type
+LISTING_KINDS = {
+    'health': {
+        'key_column': 'POL_NO',
+        'name_columns': ('NAME', 'SURNAME'),
+        'premium_column': 'TOTAL_PREMIUM',
+        'date_columns': ('EXPIRY_POL_FROM_DT', 'EXPIRY_POL_TO_DT', 'REN_POL_START_DT', 'REN_POL_TO_DT'),
+    },
+    'motor': {
+        'key_column': 'Policy No',
+        'name_columns': ('Firstname', 'Surname'),
+        'premium_column': 'New Net Premium',
+        'date_columns': ('Cover End Dt',),
+    },
+}
+
+
+def summary_path(digest, preferred_sheet=None):
+    """Return the summary JSON path for a workbook hash and sheet preference"""
+    parquet_path, _ = sidecar_paths(digest, preferred_sheet)
+    return parquet_path[:-len('.parquet')] + '.summary.json'
+
+
+def detect_kind(columns):
+    """Return 'health' or 'motor' from the listing's key column, or None"""
+    for kind, spec in LISTING_KINDS.items():
+        if spec['key_column'] in columns:
+            return kind
+    return None
+
+
+def premium_summary(series):
+    """Count premiums that are numeric (commas allowed), non-numeric and blank"""
+    text = text_values(series)
+    blank = text == ''
+    numeric = pd.to_numeric(text.str.replace(',', '', regex=False), errors='coerce').notna()
+    return {
+        'column': series.name,
+        'valid': int((numeric & ~blank).sum()),
+        'invalid': int((~numeric & ~blank).sum()),
+        'blank': int(blank.sum()),
+    }
+
+
+def date_summary(series):
+    """Count dates that parse, do not parse and are blank"""
+    if series.name == 'Cover End Dt':
+        # Motor Cover End Dt follows the generator's own format rules
+        text = text_values(series)
+        parsed = resolve_cover_dates(text)[0]['parsed']
+        blank = text == ''
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        parsed = series.notna()
+        blank = series.isna()
+    else:
+        blank = text_values(series) == ''
+        numeric = pd.to_numeric(series, errors='coerce')
+        # Excel serial numbers are accepted, like format_date in the health generator
+        parsed = numeric.notna() | pd.to_datetime(
+            series.where(numeric.isna()).astype(object), errors='coerce', format='mixed'
+        ).notna()
+    return {
+        'parseable': int((parsed & ~blank).sum()),
+        'unparseable': int((~parsed & ~blank).sum()),
+        'blank': int(blank.sum()),
+    }
+
+
+def summarize_listing(df, info, kind=None):
+    """Build the summary dictionary for a parsed listing"""
+    columns = [str(c) for c in df.columns]
+    kind = kind or detect_kind(columns)
+    spec = LISTING_KINDS.get(kind, {})
+
+    summary = {
+        'version': SUMMARY_VERSION,
+        'kind': kind,
+        'sha256': info.get('sha256'),
+        'sheet_name': info['sheet_name'],
+        'sheet_names': info['sheet_names'],
+        'columns': columns,
+        'rows': len(df),
+        'null_counts': {str(c): int(n) for c, n in df.isna().sum().items()},
+        'key_column': None,
+        'valid_keys': None,
+        'premium': None,
+        'dates': {},
+        'rejected_rows': 0,
+    }
+
+    key_column = spec.get('key_column')
+    if key_column in df.columns:
+        summary['key_column'] = key_column
+        summary['valid_keys'] = int(df[key_column].notna().sum())
+
+    premium_column = spec.get('premium_column')
+    if premium_column in df.columns:
+        summary['premium'] = premium_summary(df[premium_column])
+
+    for date_column in spec.get('date_columns', ()):
+        if date_column in df.columns:
+            summary['dates'][date_column] = date_summary(df[date_column])
+
+    # Same rules the generators apply before any QR call
+    if kind == 'health':
+        summary['rejected_rows'] = len(classify_health_frame(df)[1])
+    elif kind == 'motor':
+        summary['rejected_rows'] = len(classify_motor_records(build_motor_records(df))[1])
+
+    return summary
+
+
+def write_summary(summary, digest, preferred_sheet=None):
+    """Write the summary JSON atomically"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = summary_path(digest, preferred_sheet)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(summary, f)
+    os.replace(path + '.tmp', path)
+
+
+def read_summary(digest, preferred_sheet=None):
+    """Return a stored summary for this hash, or None"""
+    path = summary_path(digest, preferred_sheet)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            summary = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable listing summary {path}: {str(e)}")
+        return None
+    return summary if summary.get('version') == SUMMARY_VERSION else None
+
+
+def load_summary(path, preferred_sheet=None, kind=None):
+    """Return the summary for a listing, computing and storing it on first use"""
+    digest = file_sha256(path)
+    summary = read_summary(digest, preferred_sheet)
+    if summary is not None and (kind is None or summary['kind'] == kind):
+        return summary
+
+    df, info = load_listing(path, preferred_sheet, digest=digest)
+    summary = summarize_listing(df, dict(info, sha256=digest), kind)
+    try:
+        write_summary(summary, digest, preferred_sheet)
+    except Exception as e:
+        print(f"⚠️ Could not write listing summary: {str(e)}")
+    return summary
+
+
+def listing_keys_and_names(path, preferred_sheet=None, kind=None, digest=None):
+    """Return (policy numbers, customer names) of the rows with a policy number, read from the sidecar"""
+    df, _ = load_listing(path, preferred_sheet, digest=digest)
+    spec = LISTING_KINDS.get(kind or detect_kind([str(c) for c in df.columns]), {})
+    key_column = spec.get('key_column')
+    if key_column not in df.columns:
+        return [], []
+    valid = df[key_column].notna()
+    keys = [str(key) for key in df.loc[valid, key_column]]
+    name_parts = [text_values(df.loc[valid, c]) for c in spec['name_columns'] if c in df.columns]
+    if not name_parts:
+        return keys, []
+    names = name_parts[0]
+    for part in name_parts[1:]:
+        names = names + ' ' + part
+    return keys, names.str.strip().tolist()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python listing_summary.py <workbook.xlsx> [--sheet Sheet1]")
+        sys.exit(1)
+
+    workbook_path = sys.argv[1]
+    sheet = None
+    if '--sheet' in sys.argv and sys.argv.index('--sheet') + 1 < len(sys.argv):
+        sheet = sys.argv[sys.argv.index('--sheet') + 1]
+
+    try:
+        listing_summary = load_summary(workbook_path, sheet)
+        print(f"Sheet: {listing_summary['sheet_name']} (available: {listing_summary['sheet_names']})")
+        print(f"SUMMARY:{json.dumps(listing_summary)}")
+        print(f"SUCCESS:{listing_summary['rows']}")
+    except Exception as e:
+        print(f"ERROR:{str(e)}")
+        sys.exit(1)
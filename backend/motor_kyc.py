@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Motor KYC Page
+Page 2 of every motor renewal letter (renewal confirmation table, KYC request,
+customer declaration (a)-(e), PEP details table and signature line) holds no
+customer data. It is drawn once per PDF document as a form XObject and placed
+on each letter's second page with doForm; the justified declaration paragraphs
+are laid out once per process and reused by every document.
+
+Variants: 'standard' (Motor_Insurance_Renewal.py) and 'letterhead' (printer
+versions on pre-printed letterhead).
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_JUSTIFY
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+
+width, height = A4
+
+KYC_REQUEST_TEXT = "In line with customer due diligence provisions of the law, you are kindly requested to confirm that there is no change in your particulars, including your name, address and mobile number. In the contrary, please provide the updated KYC document(s) (copy of the ID card and Proof of address (not more than three (3) months)) along with the signed renewal notice."
+
+DECLARATION_POINTS = [
+    ("(a)", "there has been no change in the information and due diligence (KYC) documentation previously submitted by me/us to the Company, including details pertaining to my/our financial and professional profile and other personal details such as name, address, mobile number, occupation, status, motor vehicle details etc."),
+    ("(b)", "the statement made and the information supplied in this questionnaire are correct and there are no other facts that are relevant to the Company for assessing my/our profile(s);"),
+    ("(c)", "the premium that is being paid to the Company comes from my own savings/salary."),
+    ("(d)", "I/We agree to furnish any additional information, as may be required, during the course of this business relationship to the Company to justify whatsoever information including, but not limited to, my/our source of funds or wealth; and"),
+    ("(e)", "I/We declare that I/We do not or am/are not related to anyone who hold any position with a significant influence on public, social or governmental policy nor acting as a senior official in a state owned organization."),
+]
+
+PEP_TABLE_HEADERS = ["Name", "Address", "Contact Number", "Email", "Occupation"]
+
+FOOTER_TEXT = "This is a computer-generated document and requires no signature"
+
+# Wrapped paragraphs per (variant, key); a wrapped Paragraph can be drawn on any canvas
+_paragraphs = {}
+
+
+def _paragraph(variant, key, text, style, text_width):
+    """Return a Paragraph laid out once per process for this variant"""
+    para = _paragraphs.get((variant, key))
+    if para is None:
+        para = Paragraph(text, style)
+        para.wrap(text_width, 100)
+        _paragraphs[(variant, key)] = para
+    return para
+
+
+def _draw_standard(c):
+    """KYC page with the standard NIC header margins"""
+    margin = 50
+    y_pos = height - margin - 20  # Start higher to accommodate renewal confirmation
+
+    # Renewal confirmation section
+    c.setFillColor(colors.lightblue)
+    c.rect(margin, y_pos - 15, width - 2 * margin, 20, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    c.setFont("Cambria-Bold", 10)
+    c.drawString(margin + 5, y_pos - 10, "RENEWAL CONFIRMATION (Section to be filled in and signed by the Policyholder):")
+    y_pos -= 25
+
+    # Confirmation table with proper layout
+    col_widths = [280, 140, 100]
+    row_height = 20
+
+    # Header row
+    c.setFillColor(colors.lightgrey)
+    x_pos = margin
+    headers = ["Renewal Instructions / Remarks", "Signature", "Date"]
+
+    for i, header in enumerate(headers):
+        c.rect(x_pos, y_pos - row_height, col_widths[i], row_height, fill=1, stroke=1)
+        c.setFillColor(colors.black)
+        c.setFont("Cambria-Bold", 9)
+        c.drawString(x_pos + 5, y_pos - 15, header)
+        c.setFillColor(colors.lightgrey)
+        x_pos += col_widths[i]
+
+    y_pos -= row_height
+
+    # Data rows
+    c.setFillColor(colors.white)
+
+    # Row 1: Renew as invited
+    x_pos = margin
+    c.rect(x_pos, y_pos - row_height, col_widths[0], row_height, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    c.setFont("Cambria", 9)
+    c.drawString(x_pos + 5, y_pos - 15, "Renew as invited [ ] (Please Tick)")
+
+    x_pos += col_widths[0]
+    c.setFillColor(colors.white)
+    c.rect(x_pos, y_pos - row_height, col_widths[1], row_height, fill=1, stroke=1)
+
+    x_pos += col_widths[1]
+    c.rect(x_pos, y_pos - row_height, col_widths[2], row_height, fill=1, stroke=1)
+
+    y_pos -= row_height
+
+    # Row 2: Renew with alterations
+    x_pos = margin
+    c.setFillColor(colors.white)
+    c.rect(x_pos, y_pos - row_height, col_widths[0], row_height, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    c.drawString(x_pos + 5, y_pos - 15, "Renew with the following alteration/s:")
+
+    x_pos += col_widths[0]
+    c.setFillColor(colors.white)
+    c.rect(x_pos, y_pos - row_height, col_widths[1], row_height, fill=1, stroke=1)
+
+    x_pos += col_widths[1]
+    c.rect(x_pos, y_pos - row_height, col_widths[2], row_height, fill=1, stroke=1)
+
+    y_pos -= row_height + 30  # Extra space after renewal confirmation
+
+    # Main header paragraph
+    c.setFillColor(colors.black)
+    c.setFont("Cambria", 10)
+    c.drawString(margin, y_pos, "In line with customer due diligence provisions of the law, you are kindly requested to confirm that there is no change in")
+    y_pos -= 15
+    c.drawString(margin, y_pos, "your particulars, including your name, address and mobile number. In the contrary, please provide the updated KYC")
+    y_pos -= 15
+    c.drawString(margin, y_pos, "document(s) (copy of the ID card and Proof of address (not more than three (3) months)) along with the signed renewal")
+    y_pos -= 15
+    c.drawString(margin, y_pos, "notice.")
+    y_pos -= 30
+
+    # Customer Declaration header with blue background
+    c.setFillColor(colors.lightblue)
+    c.rect(margin, y_pos - 25, width - 2 * margin, 30, fill=1, stroke=1)
+    c.setFillColor(colors.white)
+    c.setFont("Cambria-Bold", 9)
+    c.drawString(margin + 5, y_pos - 10, "CUSTOMER DECLARATION (Applicable only to existing customers having submitted KYC documents previously for this")
+    c.drawString(margin + 5, y_pos - 22, "specific line of business and do not have any change in their particulars)")
+    c.setFillColor(colors.black)
+    y_pos -= 45
+
+    # I/We declaration line
+    c.setFont("Cambria", 10)
+    c.drawString(margin, y_pos, "I/We, ___________________________________________________________________________")
+    y_pos -= 20
+
+    # Holder declaration line
+    c.drawString(margin, y_pos, "holder(s) of National Identity Card / Passport No.(s)______________________________________________ hereby declare")
+    y_pos -= 15
+    c.drawString(margin, y_pos, "that:")
+    y_pos -= 20
+
+    # Declaration points (a) through (e) with justified alignment
+    c.setFont("Cambria", 10)
+    indent_letter = margin + 10  # Position for (a), (b), etc.
+    indent_text = margin + 30    # Position for continuation text
+    text_width = width - indent_text - margin  # Available width for justified text
+
+    justified_style = ParagraphStyle(
+        'Justified',
+        fontName='Cambria',
+        fontSize=10,
+        alignment=TA_JUSTIFY,
+        leftIndent=0,
+        rightIndent=0,
+        spaceAfter=6,
+        leading=12
+    )
+
+    for index, (label, text) in enumerate(DECLARATION_POINTS):
+        c.drawString(indent_letter, y_pos, label)
+        para = _paragraph('standard', label, text, justified_style, text_width)
+        para.drawOn(c, indent_text, y_pos - para.height + 10)
+        y_pos -= para.height + (15 if index == len(DECLARATION_POINTS) - 1 else 8)
+
+    # Italic note
+    c.setFont("Cambria", 9)
+    c.drawString(margin + 20, y_pos, "Please fill in details below if item (e) of the above declaration does not hold good:")
+    y_pos -= 25
+
+    # Information table with proper column widths
+    table_width = width - 2 * margin
+    row_height = 25
+    left_col_width = 140  # Increased width for header column
+    right_col_width = table_width - left_col_width
+
+    for i, header in enumerate(PEP_TABLE_HEADERS):
+        table_y = y_pos - (i * row_height)
+
+        # Header cell (left column) with light grey background
+        c.setFillColor(colors.lightgrey)
+        c.rect(margin, table_y - row_height, left_col_width, row_height, fill=1, stroke=1)
+        c.setFillColor(colors.black)
+        c.setFont("Cambria-Bold", 9)
+        c.drawString(margin + 5, table_y - 15, header)
+
+        # Data cell (right column)
+        c.setFillColor(colors.white)
+        c.rect(margin + left_col_width, table_y - row_height, right_col_width, row_height, fill=1, stroke=1)
+
+    y_pos -= len(PEP_TABLE_HEADERS) * row_height + 30
+
+    # Signature line
+    c.setFillColor(colors.black)
+    c.setFont("Cambria", 10)
+    c.drawString(margin, y_pos, "Signature(s): _________________________________ Date: _____________")
+    y_pos -= 60
+
+    # Footer text
+    c.setFont("Cambria", 9)
+    footer_width = c.stringWidth(FOOTER_TEXT, "Cambria", 9)
+    c.drawString((width - footer_width) / 2, y_pos, FOOTER_TEXT)
+
+
+def _draw_letterhead(c):
+    """KYC page below the pre-printed letterhead header and above its footer"""
+    side_margin = 50
+    bottom_margin = 50  # Clears the pre-printed footer
+    page2_top_margin = 132  # Page 2 uses the original margin, no logo overlap
+    y_pos = height - page2_top_margin - 15
+
+    # Renewal confirmation section (narrower than full width, aligned with the text)
+    table_width = width - 2 * side_margin - 20
+
+    c.setFillColor(colors.lightblue)
+    c.rect(side_margin, y_pos - 14, table_width, 18, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    c.setFont("Cambria-Bold", 9)
+    c.drawString(side_margin + 5, y_pos - 9, "RENEWAL CONFIRMATION (Section to be filled in and signed by the Policyholder):")
+    y_pos -= 22
+
+    # Confirmation table
+    col_widths = [265, 130, 95]
+    row_height = 18
+
+    # Header row
+    c.setFillColor(colors.lightgrey)
+    x_pos = side_margin
+    headers = ["Renewal Instructions / Remarks", "Signature", "Date"]
+
+    for i, header in enumerate(headers):
+        c.rect(x_pos, y_pos - row_height, col_widths[i], row_height, fill=1, stroke=1)
+        c.setFillColor(colors.black)
+        c.setFont("Cambria-Bold", 8.5)
+        c.drawString(x_pos + 5, y_pos - 13, header)
+        c.setFillColor(colors.lightgrey)
+        x_pos += col_widths[i]
+
+    y_pos -= row_height
+
+    # Data rows
+    c.setFillColor(colors.white)
+
+    # Row 1: Renew as invited
+    x_pos = side_margin
+    c.rect(x_pos, y_pos - row_height, col_widths[0], row_height, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    c.setFont("Cambria", 8.5)
+    c.drawString(x_pos + 5, y_pos - 13, "Renew as invited [ ] (Please Tick)")
+
+    x_pos += col_widths[0]
+    c.setFillColor(colors.white)
+    c.rect(x_pos, y_pos - row_height, col_widths[1], row_height, fill=1, stroke=1)
+
+    x_pos += col_widths[1]
+    c.rect(x_pos, y_pos - row_height, col_widths[2], row_height, fill=1, stroke=1)
+
+    y_pos -= row_height
+
+    # Row 2: Renew with alterations
+    x_pos = side_margin
+    c.setFillColor(colors.white)
+    c.rect(x_pos, y_pos - row_height, col_widths[0], row_height, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    c.drawString(x_pos + 5, y_pos - 13, "Renew with the following alteration/s:")
+
+    x_pos += col_widths[0]
+    c.setFillColor(colors.white)
+    c.rect(x_pos, y_pos - row_height, col_widths[1], row_height, fill=1, stroke=1)
+
+    x_pos += col_widths[1]
+    c.rect(x_pos, y_pos - row_height, col_widths[2], row_height, fill=1, stroke=1)
+
+    y_pos -= row_height + 25
+
+    # KYC request paragraph, justified to the table width
+    c.setFillColor(colors.black)
+
+    justified_style_table = ParagraphStyle(
+        'JustifiedTable',
+        fontName='Cambria',
+        fontSize=9,
+        alignment=TA_JUSTIFY,
+        leftIndent=0,
+        rightIndent=0,
+        spaceAfter=5,
+        leading=11
+    )
+
+    para_kyc = _paragraph('letterhead', 'kyc', KYC_REQUEST_TEXT, justified_style_table, table_width)
+    para_kyc.drawOn(c, side_margin, y_pos - para_kyc.height + 9)
+    y_pos -= para_kyc.height + 20
+
+    # Customer Declaration header with blue background
+    c.setFillColor(colors.lightblue)
+    c.rect(side_margin, y_pos - 25, width - 2 * side_margin, 32, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    c.setFont("Cambria-Bold", 8.5)
+    c.drawString(side_margin + 5, y_pos - 11, "CUSTOMER DECLARATION (Applicable only to existing customers having submitted KYC documents previously for this")
+    c.drawString(side_margin + 5, y_pos - 22, "specific line of business and do not have any change in their particulars)")
+    c.setFillColor(colors.black)
+    y_pos -= 42
+
+    # I/We declaration line
+    c.setFont("Cambria", 9)
+    c.drawString(side_margin, y_pos, "I/We, ___________________________________________________________________________")
+    y_pos -= 18
+
+    # Holder declaration line
+    c.drawString(side_margin, y_pos, "holder(s) of National Identity Card / Passport No.(s)______________________________________________ hereby declare")
+    y_pos -= 13
+    c.drawString(side_margin, y_pos, "that:")
+    y_pos -= 18
+
+    # Declaration points (a) through (e) with justified alignment
+    c.setFont("Cambria", 9)
+    indent_letter = side_margin + 10  # Position for (a), (b), etc.
+    indent_text = side_margin + 30    # Position for continuation text
+    text_width = width - indent_text - side_margin  # Available width for justified text
+
+    justified_style = ParagraphStyle(
+        'Justified',
+        fontName='Cambria',
+        fontSize=9,
+        alignment=TA_JUSTIFY,
+        leftIndent=0,
+        rightIndent=0,
+        spaceAfter=5,
+        leading=11
+    )
+
+    for index, (label, text) in enumerate(DECLARATION_POINTS):
+        c.drawString(indent_letter, y_pos, label)
+        para = _paragraph('letterhead', label, text, justified_style, text_width)
+        para.drawOn(c, indent_text, y_pos - para.height + 10)
+        y_pos -= para.height + (12 if index == len(DECLARATION_POINTS) - 1 else 8)
+
+    # Italic note
+    c.setFont("Cambria", 8.5)
+    c.drawString(side_margin + 20, y_pos, "Please fill in details below if item (e) of the above declaration does not hold good:")
+    y_pos -= 22
+
+    # Information table with proper column widths
+    table_width = width - 2 * side_margin
+    row_height = 22
+    left_col_width = 140
+    right_col_width = table_width - left_col_width
+
+    for i, header in enumerate(PEP_TABLE_HEADERS):
+        table_y = y_pos - (i * row_height)
+
+        # Header cell (left column) with light grey background
+        c.setFillColor(colors.lightgrey)
+        c.rect(side_margin, table_y - row_height, left_col_width, row_height, fill=1, stroke=1)
+        c.setFillColor(colors.black)
+        c.setFont("Cambria-Bold", 8.5)
+        c.drawString(side_margin + 5, table_y - 13, header)
+
+        # Data cell (right column)
+        c.setFillColor(colors.white)
+        c.rect(side_margin + left_col_width, table_y - row_height, right_col_width, row_height, fill=1, stroke=1)
+
+    y_pos -= len(PEP_TABLE_HEADERS) * row_height + 25
+
+    # Signature line
+    c.setFillColor(colors.black)
+    c.setFont("Cambria", 9)
+    c.drawString(side_margin, y_pos, "Signature(s): _________________________________ Date: _____________")
+
+    # Footer text, kept above the pre-printed footer area
+    c.setFont("Cambria", 8.5)
+    footer_width = c.stringWidth(FOOTER_TEXT, "Cambria", 8.5)
+    c.drawString((width - footer_width) / 2, bottom_margin + 20, FOOTER_TEXT)
+
+
+VARIANTS = {
+    'standard': _draw_standard,
+    'letterhead': _draw_letterhead,
+}
+
+
+def draw_kyc_page(c, variant='standard'):
+    """Place the KYC page on the current page, defining its form on first use in this document"""
+    form_name = f"MotorKYC_{variant}"
+    if not c.hasForm(form_name):
+        c.beginForm(form_name)
+        VARIANTS[variant](c)
+        c.endForm()
+    c.doForm(form_name)
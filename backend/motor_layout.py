@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Motor Layout
+One layout engine for the motor renewal letter, shared by
+Motor_Insurance_Renewal.py (variant 'standard'),
+Motor_Insurance_Renewal_Printer_version.py ('letterhead') and
+Hanlde_MobileNum.py ('letterhead_mobile').
+
+Each variant is a plain spec in VARIANTS: margins, font sizes, spacing, the
+banner or letterhead header, table styling, the notes and paragraphs and the
+payment block sizes. prepare() turns a spec into a Layout once per process:
+static paragraphs are wrapped, label and header widths measured, column
+positions and logo sizes computed. render() then only draws the customer's
+values on top of that precomputed layout.
+"""
+
+import os
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_JUSTIFY
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+
+import asset_cache
+import motor_kyc
+import paragraph_cache
+import qr_render
+
+width, height = A4
+
+NOTE1_TEXT = "The Renewal Premium, which includes applicable fees and charges, is valid as at the date of this letter and may be subject to change in case of any claim intimation arising post issuance of this letter and prior expiry of the present cover."
+NOTE2_TEXT = "The Proposed Insured's Declared Value (\"IDV\") of the vehicle, including accessories if any fitted thereon, will be deemed to be the 'Sum Insured' for the Motor Insurance Policy and will be the amount insured for your vehicle. It will be the basis to determine the total loss settlements in the event the vehicle is stolen or damaged beyond repair in an accident. However, you will be compensated only for a sum equivalent to the Current Market Value of the insured vehicle at the time of loss and will not be more than the Proposed IDV."
+IDV_TEXT = "The Proposed IDV set above is based on a depreciation rate applied to the Expiring IDV. As client, you may wish to review the Proposed IDV and obtain the Current Market Value of the vehicle from an independent Surveyor at your own cost. As Insurer, we recommend that you insure your vehicle at its Current Market Value by taking into consideration all the factors which determine its market value including, but not limited to, its age, mileage and current condition, inclusive of all taxes and charges."
+DIFFERENT_TERMS_TEXT = "Should you wish to insure your vehicle under different terms, you are kindly invited to fill in the table below and to contact us within two weeks prior to expiry of the current Policy."
+DIFFERENT_TERMS_BANK_TEXT = "Should you wish to insure your vehicle under different terms, you are kindly invited to fill in the table below and to contact us within two weeks prior to expiry of the current Policy. Alternatively, kindly fill in the Renewal Confirmation section and submit the signed Renewal Notice together with payment* or evidence of bank transfer on any of the following Account Numbers: Maubank (060100056724), MCB (000444155732) or SBM (61030100056822) for renewal and issuance of your Policy."
+OUTSTANDING_TEXT = "*Any outstanding balance on the expiring policy will need to be settled as at the renewal date."
+ASSISTANCE_TEXT = "For any assistance, please feel free to contact us at the nearest branch office or your Insurance Advisor. Alternatively, you may call us on 602-3000."
+OUTSTANDING_ASSISTANCE_TEXT = "*Any outstanding balance on the expiring policy will need to be settled as at the renewal date. For any assistance, please feel free to contact us at the nearest branch office or your Insurance Advisor. Alternatively, you may call us on 602-3000."
+QR_PAYMENT_TEXT = "For your convenience, you may also settle payments instantly via the MauCAS QR Code (Scan to Pay) below using any mobile banking app such as Juice, MauBank WithMe, Blink, MyT Money, or other supported applications."
+
+# Cover table header: one or two lines per column
+TABLE_HEADERS = [
+    ("Vehicle Description",),
+    ("Compulsory Excess", "(MUR)"),
+    ("Expiring IDV (MUR)", "Note 2"),
+    ("Proposed IDV (MUR)", "Note 2"),
+    ("Renewal Premium", "(MUR) - Note 1"),
+]
+TABLE_COL_WIDTHS = [140, 85, 85, 85, 100]
+
+STANDARD = {
+    'margin': 50,
+    'kyc': 'standard',
+    # NIC logo and blue title banner drawn on the page
+    'banner': {'logo': "NICLOGO.jpg", 'logo_width': 100, 'logo_top': 20, 'logo_gap': 8,
+               'title': "MOTOR INSURANCE RENEWAL NOTICE", 'title_size': 12, 'after': 40},
+    'top_margin': None,
+    'font_size': 10, 'leading': 12, 'space_after': 6,
+    'date_gap': 20, 'address_line': 12,
+    'address_logo': None,
+    'address_gap': 8, 'salutation_gap': 20, 'subject_gap': 20,
+    'subject_prefix': "Re: Motor Insurance Policy No.: ",
+    'motor_type': "PRIVATE MOTOR",  # None: the record's motor_type
+    'main_gap': 10,
+    'table': {'header_height': 30, 'header_size': 8, 'header_align': 'left',
+              'data_height': 50, 'cell_font': "Cambria", 'cell_size': 8, 'cell_baseline': 25,
+              'vehicle_number_only': False, 'after': 20},
+    'note_label_size': 9, 'note_gaps': (10, 10),
+    'paragraphs': [(IDV_TEXT, 5), (DIFFERENT_TERMS_TEXT, 15), (OUTSTANDING_TEXT, 5),
+                   (ASSISTANCE_TEXT, 5), (QR_PAYMENT_TEXT, 8)],
+    'payment': {'lift': 10, 'maucas_width': 100, 'maucas_gap': 3, 'qr_size': 80, 'qr_gap': 3,
+                'zwennpay_width': 70, 'zwennpay_gap': 3},
+    'after_payment': [],
+}
+
+# Pre-printed letterhead: no banner, smaller type, logo beside the address
+LETTERHEAD = {
+    'margin': 50,
+    'kyc': 'letterhead',
+    'banner': None,
+    'top_margin': 170,  # clears the NIC logo printed on the paper
+    'font_size': 9, 'leading': 11, 'space_after': 5,
+    'date_gap': 18, 'address_line': 11,
+    'address_logo': {'logo': "isphere_logo.jpg", 'width': 225},
+    'address_gap': 6, 'salutation_gap': 18, 'subject_gap': 18,
+    'subject_prefix': "Re: Renewal for Motor Insurance Policy No.: ",
+    'motor_type': None,
+    'main_gap': 8,
+    'table': {'header_height': 28, 'header_size': 7.5, 'header_align': 'center',
+              'data_height': 25, 'cell_font': "Cambria-Bold", 'cell_size': 8.5, 'cell_baseline': 15,
+              'vehicle_number_only': True, 'after': 15},
+    'note_label_size': 8.5, 'note_gaps': (8, 15),
+    'paragraphs': [(IDV_TEXT, 15), (DIFFERENT_TERMS_BANK_TEXT, 12), (QR_PAYMENT_TEXT, 6)],
+    'payment': {'lift': 8, 'maucas_width': 85, 'maucas_gap': 2, 'qr_size': 85, 'qr_gap': 2,
+                'zwennpay_width': 60, 'zwennpay_gap': 15},
+    'after_payment': [(OUTSTANDING_ASSISTANCE_TEXT, 6)],
+}
+
+VARIANTS = {
+    'standard': STANDARD,
+    'letterhead': LETTERHEAD,
+    # Hanlde_MobileNum.py: letterhead layout, motor type always PRIVATE MOTOR
+    'letterhead_mobile': dict(LETTERHEAD, motor_type="PRIVATE MOTOR"),
+}
+
+
+def format_amount(amount_str):
+    """Format amount with comma delimiters and rounding"""
+    try:
+        # Remove existing commas and convert to float
+        amount = float(str(amount_str).replace(',', '').strip())
+        # Round to nearest integer and format with commas
+        return f"{int(round(amount)):,}"
+    except (ValueError, AttributeError):
+        return str(amount_str)
+
+
+def _logo(path, logo_width):
+    """(path, width, height) of a logo scaled to logo_width, or None when the file is missing"""
+    if not os.path.exists(path):
+        print(f"⚠️ {path} not found - skipping logo")
+        return None
+    img = asset_cache.image(path)
+    img_width, img_height = img.getSize()
+    return img.path, logo_width, logo_width * (img_height / img_width)
+
+
+def _wrapped(text, style, text_width):
+    para = Paragraph(text, style)
+    para.wrap(text_width, 100)
+    return para
+
+
+class Layout:
+    """A variant spec with everything that does not depend on the customer precomputed"""
+
+    def __init__(self, spec):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        self.spec = spec
+        self.margin = margin = spec['margin']
+        self.text_width = width - 2 * margin
+        self.style = ParagraphStyle(
+            'JustifiedPage1',
+            fontName='Cambria',
+            fontSize=spec['font_size'],
+            alignment=TA_JUSTIFY,
+            leftIndent=0,
+            rightIndent=0,
+            spaceAfter=spec['space_after'],
+            leading=spec['leading']
+        )
+
+        banner = spec['banner']
+        if banner:
+            self.banner_logo = _logo(banner['logo'], banner['logo_width'])
+            title_width = stringWidth(banner['title'], "Cambria-Bold", banner['title_size'])
+            self.banner_title_x = (width - title_width) / 2
+        self.address_logo = _logo(spec['address_logo']['logo'], spec['address_logo']['width']) if spec['address_logo'] else None
+
+        # Cover table: column positions and header lines placed once
+        table = spec['table']
+        self.column_x = []
+        x_pos = margin
+        for col_width in TABLE_COL_WIDTHS:
+            self.column_x.append(x_pos)
+            x_pos += col_width
+        self.header_lines = []
+        for x_pos, col_width, lines in zip(self.column_x, TABLE_COL_WIDTHS, TABLE_HEADERS):
+            offsets = (15,) if len(lines) == 1 else (10, 20)
+            placed = []
+            for line, offset in zip(lines, offsets):
+                if table['header_align'] == 'center':
+                    line_x = x_pos + (col_width / 2) - (stringWidth(line, "Cambria-Bold", table['header_size']) / 2)
+                else:
+                    line_x = x_pos + 2
+                placed.append((line_x, offset, line))
+            self.header_lines.append(placed)
+
+        # Notes: label widths and the wrapped text beside them
+        label_size = spec['note_label_size']
+        self.notes = []
+        for label, text, gap in (("Note 1: ", NOTE1_TEXT, spec['note_gaps'][0]),
+                                 ("Note 2: ", NOTE2_TEXT, spec['note_gaps'][1])):
+            label_width = stringWidth(label, "Cambria-Bold", label_size)
+            self.notes.append((label, label_width, _wrapped(text, self.style, self.text_width - label_width), gap))
+
+        self.paragraphs = [(_wrapped(text, self.style, self.text_width), gap) for text, gap in spec['paragraphs']]
+        self.after_payment = [(_wrapped(text, self.style, self.text_width), gap) for text, gap in spec['after_payment']]
+
+        payment = spec['payment']
+        self.maucas = _logo("maucas2.jpeg", payment['maucas_width'])
+        self.zwennpay = _logo("zwennPay.jpg", payment['zwennpay_width'])
+
+
+_layouts = {}
+
+
+def prepare(variant):
+    """Return the precomputed Layout of a variant (logos are looked up in the working directory)"""
+    key = (variant, os.getcwd())
+    layout = _layouts.get(key)
+    if layout is None:
+        layout = _layouts[key] = Layout(VARIANTS[variant])
+    return layout
+
+
+def _draw_header(c, layout):
+    """Banner header, or the top margin below the pre-printed letterhead; returns y"""
+    spec = layout.spec
+    banner = spec['banner']
+    if not banner:
+        return height - spec['top_margin']
+
+    margin = layout.margin
+    if layout.banner_logo:
+        path, logo_width, logo_height = layout.banner_logo
+        logo_y = height - logo_height - banner['logo_top']
+        asset_cache.draw_image(c, path, (width - logo_width) / 2, logo_y, width=logo_width, height=logo_height)
+        y_pos = logo_y - banner['logo_gap']
+    else:
+        y_pos = height - margin
+
+    c.setFillColor(colors.Color(70/255, 130/255, 180/255))  # Steel blue
+    c.rect(margin, y_pos - 20, width - 2 * margin, 25, fill=1, stroke=1)
+    c.setFillColor(colors.white)
+    c.setFont("Cambria-Bold", banner['title_size'])
+    c.drawString(layout.banner_title_x, y_pos - 15, banner['title'])
+    c.setFillColor(colors.black)
+    return y_pos - banner['after']
+
+
+def _draw_table(c, layout, data, y_pos):
+    spec = layout.spec
+    table = spec['table']
+    header_height = table['header_height']
+    data_height = table['data_height']
+
+    c.setFillColor(colors.lightgrey)
+    for x_pos, col_width, placed in zip(layout.column_x, TABLE_COL_WIDTHS, layout.header_lines):
+        c.rect(x_pos, y_pos - header_height, col_width, header_height, fill=1, stroke=1)
+        c.setFillColor(colors.black)
+        c.setFont("Cambria-Bold", table['header_size'])
+        for line_x, offset, line in placed:
+            c.drawString(line_x, y_pos - offset, line)
+        c.setFillColor(colors.lightgrey)
+    y_pos -= header_height
+
+    vehicle = data['vehicle_no'] if table['vehicle_number_only'] else data['vehicle_desc']
+    cells = [
+        vehicle,
+        format_amount(data['compulsory_excess']),
+        format_amount(data['idv']),
+        format_amount(data['revised_idv']),
+        format_amount(data['new_net_premium']),
+    ]
+    cell_font, cell_size = table['cell_font'], table['cell_size']
+
+    c.setFillColor(colors.white)
+    for i, (x_pos, col_width, cell) in enumerate(zip(layout.column_x, TABLE_COL_WIDTHS, cells)):
+        c.rect(x_pos, y_pos - data_height, col_width, data_height, fill=1, stroke=1)
+        c.setFillColor(colors.black)
+        c.setFont(cell_font, cell_size)
+        if i == 0 and not table['vehicle_number_only']:
+            # Full vehicle description, one line per detail
+            for j, line in enumerate(cell.split('\n')):
+                c.drawString(x_pos + 3, y_pos - 12 - (j * 10), line)
+        else:
+            text = str(cell)
+            text_width = c.stringWidth(text, cell_font, cell_size)
+            c.drawString(x_pos + (col_width - text_width) / 2, y_pos - table['cell_baseline'], text)
+        c.setFillColor(colors.white)
+    return y_pos - data_height - table['after']
+
+
+def _draw_payment(c, layout, qr_code, y_pos):
+    """MauCAS logo, QR code and ZwennPay logo stacked in the page centre"""
+    payment = layout.spec['payment']
+    stack_y = y_pos + payment['lift']
+    center_x = width / 2
+
+    if layout.maucas:
+        path, logo_width, logo_height = layout.maucas
+        asset_cache.draw_image(c, path, center_x - (logo_width / 2), stack_y - logo_height, width=logo_width, height=logo_height)
+        stack_y -= logo_height + payment['maucas_gap']
+
+    if qr_code is not None:
+        qr_size = payment['qr_size']
+        qr_render.draw_qr(c, qr_code, center_x - (qr_size / 2), stack_y - qr_size, qr_size)
+        stack_y -= qr_size + payment['qr_gap']
+
+        if layout.zwennpay:
+            path, logo_width, logo_height = layout.zwennpay
+            asset_cache.draw_image(c, path, center_x - (logo_width / 2), stack_y - logo_height, width=logo_width, height=logo_height)
+            stack_y -= logo_height + payment['zwennpay_gap']
+    return stack_y
+
+
+def draw_renewal_page(c, data, qr_code, variant='standard'):
+    """Page 1 - Motor Insurance Renewal Notice"""
+    layout = prepare(variant)
+    spec = layout.spec
+    margin = layout.margin
+
+    y_pos = _draw_header(c, layout)
+
+    # Date and address
+    c.setFont("Cambria", spec['font_size'])
+    c.drawString(margin, y_pos, data['date'])
+    y_pos -= spec['date_gap']
+    address = [data['name'], data['address1']] + [line for line in (data['address2'], data['address3']) if line]
+    for line in address:
+        c.drawString(margin, y_pos, line)
+        y_pos -= spec['address_line']
+    if layout.address_logo:
+        # Bottom edge level with the end of the address, right edge on the margin
+        path, logo_width, logo_height = layout.address_logo
+        asset_cache.draw_image(c, path, width - margin - logo_width, y_pos, width=logo_width, height=logo_height)
+    y_pos -= spec['address_gap']
+
+    # Salutation - "Dear Valued Customer" for corporate customers (blank Title)
+    salutation = f"Dear {data['designation']}" if data['title'].strip() else "Dear Valued Customer"
+    c.drawString(margin, y_pos, salutation)
+    y_pos -= spec['salutation_gap']
+
+    # Subject - old and new policy numbers for renewed policies
+    c.setFont("Cambria-Bold", spec['font_size'])
+    business_type = data['business_type'].strip().lower() if data['business_type'] else ''
+    if business_type == 'renewed' and data['old_policy_no'].strip():
+        subject_line = f"{spec['subject_prefix']}{data['old_policy_no']} – New Policy No.: {data['policy_no']}"
+    else:
+        subject_line = f"{spec['subject_prefix']}{data['policy_no']}"
+    c.drawString(margin, y_pos, subject_line)
+    y_pos -= spec['subject_gap']
+
+    # Main content (dates and motor type repeat across letters, so its layout is cached by text)
+    c.setFont("Cambria", spec['font_size'])
+    motor_type = spec['motor_type'] or data['motor_type']
+    main_text = f"We wish to inform you that your {motor_type} Insurance Policy is expiring on {data['expiry_date']}. We are pleased to invite you to renew your insurance cover for the period {data['renewal_start']} to {data['renewal_end']} on the following terms:"
+    para_main = paragraph_cache.layout(c, main_text, layout.style, layout.text_width, 100)
+    para_main.drawOn(c, margin, y_pos - para_main.height + 10)
+    y_pos -= para_main.height + spec['main_gap']
+
+    y_pos = _draw_table(c, layout, data, y_pos)
+
+    # Notes, with the text justified beside its label
+    c.setFillColor(colors.black)
+    for label, label_width, para, gap in layout.notes:
+        c.setFont("Cambria-Bold", spec['note_label_size'])
+        c.drawString(margin, y_pos, label)
+        para.drawOn(c, margin + label_width, y_pos - para.height + 9)
+        y_pos -= para.height + gap
+
+    for para, gap in layout.paragraphs:
+        para.drawOn(c, margin, y_pos - para.height + 9)
+        y_pos -= para.height + gap
+
+    y_pos = _draw_payment(c, layout, qr_code, y_pos)
+
+    for para, gap in layout.after_payment:
+        para.drawOn(c, margin, y_pos - para.height + 9)
+        y_pos -= para.height + gap
+
+
+def letter_path(record, output_dir):
+    """PDF path of a record's letter in output_dir, kept under the Windows path limit"""
+    safe_name = record.safe_name
+    safe_policy = record.safe_policy
+
+    # Create filename and check total path length
+    base_filename = f"Motor_Renewal_{safe_name}_{safe_policy}.pdf"
+    pdf_filename = os.path.join(output_dir, base_filename)
+
+    # If path is still too long, truncate further
+    if len(pdf_filename) > 250:  # Leave some buffer under 260 char limit
+        # Calculate how much to truncate
+        excess = len(pdf_filename) - 250
+        new_name_length = max(20, len(safe_name) - excess)  # Minimum 20 chars for name
+        safe_name = safe_name[:new_name_length]
+        base_filename = f"Motor_Renewal_{safe_name}_{safe_policy}.pdf"
+        pdf_filename = os.path.join(output_dir, base_filename)
+    return pdf_filename
+
+
+def render(c, data, qr_code, variant='standard'):
+    """Draw both pages of one letter; the caller saves the canvas or carries on with it"""
+    draw_renewal_page(c, data, qr_code, variant)
+    c.showPage()
+    motor_kyc.draw_kyc_page(c, VARIANTS[variant]['kyc'])
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Motor QR Payloads
+ZwennPay GetMerchantQR payloads of the motor letters and the QR fetch shared by
+the motor scripts and letter_api.py; importing it has no side effects
+"""
+
+import requests
+
+import qr_client
+import qr_render
+
+
+def build_qr_payload(record):
+    """Return the ZwennPay GetMerchantQR request payload for a record"""
+    # Customer label, bill number and mobile were prepared by the normalization stage
+    full_name = record.qr_label
+    mobile_no = record.mobile_no
+    policy_no_api = record.policy_no_api
+
+    # Check if mobile number exists (not null/empty)
+    has_mobile = bool(mobile_no)
+
+    payload = {
+        "MerchantId": 155,
+        "SetTransactionAmount": False,
+        "TransactionAmount": 0,
+        "SetConvenienceIndicatorTip": False,
+        "ConvenienceIndicatorTip": 0,
+        "SetConvenienceFeeFixed": False,
+        "ConvenienceFeeFixed": 0,
+        "SetConvenienceFeePercentage": False,
+        "ConvenienceFeePercentage": 0,
+        "SetAdditionalBillNumber": True,
+        "AdditionalRequiredBillNumber": False,
+        "AdditionalBillNumber": str(policy_no_api),
+        "SetAdditionalMobileNo": has_mobile,
+        "AdditionalRequiredMobileNo": False,
+        "AdditionalMobileNo": str(mobile_no) if has_mobile else "",
+        "SetAdditionalStoreLabel": False,
+        "AdditionalRequiredStoreLabel": False,
+        "AdditionalStoreLabel": "",
+        "SetAdditionalLoyaltyNumber": False,
+        "AdditionalRequiredLoyaltyNumber": False,
+        "AdditionalLoyaltyNumber": "",
+        "SetAdditionalReferenceLabel": False,
+        "AdditionalRequiredReferenceLabel": False,
+        "AdditionalReferenceLabel": "",
+        "SetAdditionalCustomerLabel": True,
+        "AdditionalRequiredCustomerLabel": False,
+        "AdditionalCustomerLabel": str(full_name),
+        "SetAdditionalTerminalLabel": False,
+        "AdditionalRequiredTerminalLabel": False,
+        "AdditionalTerminalLabel": "",
+        "SetAdditionalPurposeTransaction": True,
+        "AdditionalRequiredPurposeTransaction": False,
+        "AdditionalPurposeTransaction": str(record.nic)
+    }
+    return payload
+
+
+def letterhead_qr_label(record):
+    """Customer label of the letterhead version (Motor_Insurance_Renewal_Printer_version.py rules).
+
+    First initial + surname, else the surname, else the first name; max 24 characters.
+    """
+    return record.qr_label or record.firstname[:24]
+
+
+def build_letterhead_qr_payload(record):
+    """GetMerchantQR payload of the letterhead version, whose purpose is always 'NICMotor'"""
+    payload = build_qr_payload(record)
+    payload["AdditionalCustomerLabel"] = letterhead_qr_label(record)
+    payload["AdditionalPurposeTransaction"] = "NICMotor"
+    return payload
+
+
+def build_mobile_qr_payload(record):
+    """GetMerchantQR payload of the Hanlde_MobileNum.py version, which always sends the mobile number"""
+    payload = build_qr_payload(record)
+    payload["SetAdditionalMobileNo"] = True
+    payload["AdditionalMobileNo"] = str(record.mobile_no)
+    return payload
+
+
+def fetch_qr_code(policy_data, payload, qr_fetch=None):
+    """Payment QR code for a record from its prefetched (or an inline) API call; None when unavailable"""
+    try:
+        response = qr_fetch.get() if qr_fetch else qr_client.post_merchant_qr(payload)
+
+        if response.status_code == 200:
+            qr_data = str(response.text).strip()
+            if not qr_data or qr_data.lower() in ('null', 'none', 'nan'):
+                print(f"⚠️ No valid QR data received for {policy_data['name']}")
+                return None
+            return qr_render.make_qr(qr_data)
+        print(f"❌ API request failed for {policy_data['name']}: {response.status_code} - {response.text}")
+        return None
+
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ Network error while generating QR for {policy_data['name']}: {str(e)}")
+        return None
+    except Exception as e:
+        print(f"⚠️ Error generating QR for {policy_data['name']}: {str(e)}")
+        return None
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Motor Renewal Records
+Cleans the motor renewal listing in one vectorized pass and turns every row into a
+compact MotorRecord, so the letter loop only has to render
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from cover_dates import resolve_cover_dates
+
+# Excel column -> record field (text columns, stripped, blank when missing)
+MOTOR_COLUMNS = {
+    'Title': 'title',
+    'Firstname': 'firstname',
+    'Surname': 'surname',
+    'Address1': 'address1',
+    'Address2': 'address2',
+    'Address3': 'address3',
+    'Policy No': 'policy_no',
+    'Cover End Dt': 'cover_end_dt',
+    'Make': 'make',
+    'Model': 'model',
+    'Vehicle No': 'vehicle_no',
+    'Chassis No': 'chassis_no',
+    'Compulsory Excess': 'compulsory_excess',
+    'IDV': 'idv',
+    'Revised IDV': 'revised_idv',
+    'New Net Premium': 'new_net_premium',
+    'NIC Number': 'nic',
+    'Business Type': 'business_type',
+    'Old Policy No': 'old_policy_no',
+    'Mobile No': 'mobile_no',
+    'Motor_type': 'motor_type',
+    # Fallback renewal dates, used when Cover End Dt is blank
+    'Expiry Date': 'expiry_date',
+    'Renewal Start': 'renewal_start',
+    'Renewal End': 'renewal_end',
+}
+
+# Fields derived from the columns above
+DERIVED_FIELDS = (
+    'row_number', 'date', 'name', 'designation', 'vehicle_desc', 'premium_valid', 'date_valid',
+    'safe_name', 'safe_policy', 'qr_label', 'policy_no_api',
+)
+
+
+class MotorRecord:
+    """One cleaned listing row; supports record['field'] access like the old policy_data dict"""
+
+    __slots__ = tuple(MOTOR_COLUMNS.values()) + DERIVED_FIELDS
+
+    def __init__(self, **fields):
+        for field, value in fields.items():
+            setattr(self, field, value)
+
+    def __getitem__(self, field):
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        setattr(self, field, value)
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def as_dict(self, exclude=()):
+        return {field: getattr(self, field) for field in self.__slots__ if field not in exclude}
+
+
+def clean_text_column(df, column):
+    """Return a column as stripped strings with NaN/missing values as ''"""
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    values = df[column]
+    missing = values.isna()
+    cleaned = values.astype(str).str.strip().astype(object)
+    cleaned[missing] = ''
+    return cleaned
+
+
+def sanitize_name_column(names):
+    """Make customer names filename-safe (same rules as the original per-row cleaner)"""
+    safe = names
+    for old, new in (('â€"', '-'), ('–', '-'), ('—', '-'), ('"', ''), ("'", ''), ('`', '')):
+        safe = safe.str.replace(old, new, regex=False)
+    # Remove any remaining non-ASCII characters and replace with underscore
+    safe = safe.str.replace(r'[^\x00-\x7F]+', '_', regex=True)
+    # Replace spaces and path separators
+    safe = safe.str.replace(' ', '_', regex=False).str.replace('/', '_', regex=False).str.replace('\\', '_', regex=False)
+    # Collapse repeated underscores, trim them and truncate to prevent Windows path length issues
+    safe = safe.str.replace(r'_+', '_', regex=True).str.strip('_')
+    return safe.str[:100]
+
+
+def normalize_motor_frame(df, row_offset=0):
+    """Clean the whole listing (or one chunk of it) in one pass and return a DataFrame of record fields.
+
+    row_offset is the number of listing rows before this chunk, so row numbers
+    stay global when a listing is processed in chunks.
+    """
+    fields = pd.DataFrame(
+        {field: clean_text_column(df, column) for column, field in MOTOR_COLUMNS.items()},
+        index=df.index,
+    )
+
+    fields['row_number'] = range(row_offset + 1, row_offset + len(df) + 1)
+    fields['date'] = datetime.now().strftime('%d %B %Y')  # System Date
+
+    full_name = (fields['title'] + ' ' + fields['firstname'] + ' ' + fields['surname']).str.strip()
+    fields['name'] = full_name
+    fields['designation'] = full_name
+    fields['vehicle_desc'] = (
+        'COMPREHENSIVE COVER\n' + fields['make'] + ' ' + fields['model'] + '\n'
+        + fields['vehicle_no'] + '\n' + fields['chassis_no']
+    )
+
+    # New Net Premium must be numeric (commas allowed)
+    premium = pd.to_numeric(fields['new_net_premium'].str.replace(',', '', regex=False), errors='coerce')
+    fields['premium_valid'] = premium.notna() & (fields['new_net_premium'] != '')
+
+    # Renewal dates from Cover End Dt; blank Cover End Dt keeps the fallback date columns
+    dates, _ = resolve_cover_dates(fields['cover_end_dt'])
+    parsed = dates['parsed']
+    for column in ('expiry_date', 'renewal_start', 'renewal_end'):
+        fields[column] = fields[column].where(~parsed, dates[column])
+    fields['date_valid'] = parsed | (fields['cover_end_dt'] == '')
+
+    fields['safe_name'] = sanitize_name_column(full_name)
+    fields['safe_policy'] = fields['policy_no'].str.replace('/', '_', regex=False).str.replace('\\', '_', regex=False)
+
+    # QR customer label: first initial + surname, max 24 characters
+    first_initial = fields['firstname'].str[:1].str.upper()
+    initial_and_surname = (first_initial + ' ' + fields['surname']).str[:24]
+    fields['qr_label'] = initial_and_surname.where(
+        (first_initial != '') & (fields['surname'] != ''),
+        fields['surname'].str[:24],
+    )
+    fields['policy_no_api'] = fields['policy_no'].str.replace('/', '.', regex=False).str.replace('-', '..', regex=False)
+
+    return fields
+
+
+def build_motor_records(df, row_offset=0):
+    """Normalize the listing and return it as a list of MotorRecord objects"""
+    fields = normalize_motor_frame(df, row_offset)
+    names = list(fields.columns)
+    columns = [fields[name].tolist() for name in names]
+    return [MotorRecord(**dict(zip(names, values))) for values in zip(*columns)]
+
+
+def iter_motor_record_chunks(frames):
+    """Yield a list of MotorRecord objects for each DataFrame chunk of a listing"""
+    row_offset = 0
+    for frame in frames:
+        yield build_motor_records(frame, row_offset)
+        row_offset += len(frame)
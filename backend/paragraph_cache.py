@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Paragraph Cache
+Most of the healthcare letter's body (special terms, upgrade, renewal procedure,
+services, contact and closing paragraphs) is the same text for every customer,
+yet Paragraph.wrap splits and measures it again on each letter. layout() wraps a
+paragraph once per (style, width, text) and hands back the same laid-out
+Paragraph afterwards; drawing it on another canvas reuses the measured lines and
+height. Blocks with customer values (premium, dates) only get a new entry when
+their text actually differs, and the oldest entries are dropped past MAX_ENTRIES.
+
+Set PARAGRAPH_CACHE=0 to lay out every paragraph again (debugging).
+"""
+
+import os
+from collections import OrderedDict
+
+from reportlab.platypus import Paragraph
+
+PARAGRAPH_CACHE_ENABLED = os.getenv('PARAGRAPH_CACHE', '1') != '0'
+MAX_ENTRIES = int(os.getenv('PARAGRAPH_CACHE_MAX_ENTRIES', '512'))
+
+_layouts = OrderedDict()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def layout(c, text, style, max_width, max_height=1000):
+    """Return a Paragraph wrapped to max_width, reusing an earlier layout of the same block"""
+    if not PARAGRAPH_CACHE_ENABLED:
+        para = Paragraph(text, style)
+        para.wrapOn(c, max_width, max_height)
+        return para
+
+    # The cached Paragraph holds its style, so the style's id cannot be reused while the entry lives
+    key = (id(style), max_width, max_height, text)
+    para = _layouts.get(key)
+    if para is not None:
+        _layouts.move_to_end(key)
+        _stats['hits'] += 1
+        return para
+
+    _stats['misses'] += 1
+    para = Paragraph(text, style)
+    para.wrapOn(c, max_width, max_height)
+    _layouts[key] = para
+    if len(_layouts) > MAX_ENTRIES:
+        _layouts.popitem(last=False)
+    return para
+
+
+def stats():
+    """Return (hits, misses) since the process started"""
+    return _stats['hits'], _stats['misses']
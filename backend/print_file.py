@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Print File
+Draws many letters straight into one PDF with an outline entry per letter, so
+a print run needs no per-letter files and no merge step. Fonts, logos and
+shared forms (such as the motor KYC page) are embedded once for the whole file.
+"""
+
+import os
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+
+class PrintFile:
+    """One canvas collecting letters; every letter starts on a new page"""
+
+    def __init__(self, path):
+        self.path = path
+        self.canvas = canvas.Canvas(path, pagesize=A4)
+        self.canvas.showOutline()  # open the bookmarks pane in PDF viewers
+        self.letters = 0
+        self.pages_drawn = 0  # form names already used, failed letters included
+
+    def add_letter(self, title, draw, *args):
+        """draw(canvas, *args) one letter and add its pages, the first bookmarked as `title`.
+
+        Each page is drawn into a form XObject before anything is added to the
+        file, so when draw raises no page, bookmark or outline entry is left
+        behind (the unused forms are harmless) and the error is re-raised.
+        """
+        c = self.canvas
+        pages = self._draw_pages(draw, args)
+        key = f"letter{self.letters}"
+        c.bookmarkPage(key)
+        c.addOutlineEntry(title, key, level=0)
+        for form_name in pages:
+            c.doForm(form_name)
+            c.showPage()
+        self.letters += 1
+
+    def _draw_pages(self, draw, args):
+        """Run draw with each of its pages going into a new form; returns the form names"""
+        c = self.canvas
+        pages = []
+
+        def begin_page():
+            pages.append(f"PrintFilePage{self.pages_drawn}")
+            self.pages_drawn += 1
+            c.beginForm(pages[-1])
+
+        def next_page():
+            # draw's showPage() ends the page's form and starts the next one
+            c.endForm()
+            begin_page()
+
+        begin_page()
+        c.showPage = next_page
+        try:
+            draw(c, *args)
+        except Exception:
+            # Close every form the letter left open (its own and any it was defining)
+            while c._formData is not None:
+                c.endForm()
+            raise
+        finally:
+            del c.showPage
+        c.endForm()
+        return pages
+
+    def save(self):
+        """Write the file; returns False (and writes nothing) when no letter was added"""
+        if not self.letters:
+            return False
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.canvas.save()
+        return True
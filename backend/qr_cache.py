@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+QR Cache
+SQLite store of GetMerchantQR responses keyed by a canonical hash of the request
+payload. A QR string is fully determined by its payload, so re-runs and the
+printer version reuse earlier answers instead of calling ZwennPay again.
+
+Answers are only valid for the endpoint that gave them: with ZWENNPAY_QR_URL
+pointing anywhere but production (e.g. stubs/server.py) the default database
+is a separate file per endpoint and the endpoint is part of every key.
+
+Environment:
+  QR_CACHE=0             disable the cache
+  QR_CACHE_PATH          database file (default backend/qr_cache.sqlite3,
+                         backend/qr_cache-<endpoint>.sqlite3 off production)
+  QR_CACHE_TTL_DAYS      entries older than this are refetched (default 90)
+  QR_CACHE_MAX_ENTRIES   least recently used entries beyond this are evicted
+  QR_OFFLINE=1           never call the API; rows without a cached QR get none
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+PRODUCTION_QR_URL = 'https://api.zwennpay.com:9425/api/v1.0/Common/GetMerchantQR'
+QR_ENDPOINT = os.environ.get('ZWENNPAY_QR_URL') or PRODUCTION_QR_URL  # the URL qr_client.py calls
+
+
+def endpoint_tag(endpoint):
+    """Short file-name-safe name of a non-production endpoint"""
+    host = urlsplit(endpoint).hostname or 'endpoint'
+    return f"{re.sub(r'[^A-Za-z0-9.-]', '_', host)}-{hashlib.sha256(endpoint.encode('utf-8')).hexdigest()[:8]}"
+
+
+def default_cache_path(endpoint=QR_ENDPOINT):
+    name = 'qr_cache.sqlite3' if endpoint == PRODUCTION_QR_URL else f"qr_cache-{endpoint_tag(endpoint)}.sqlite3"
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+
+ENABLED = os.environ.get('QR_CACHE', '1') != '0'
+OFFLINE = os.environ.get('QR_OFFLINE', '0') == '1'
+CACHE_PATH = os.environ.get('QR_CACHE_PATH', default_cache_path())
+TTL_DAYS = float(os.environ.get('QR_CACHE_TTL_DAYS', '90'))
+MAX_ENTRIES = int(os.environ.get('QR_CACHE_MAX_ENTRIES', '200000'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS qr_cache (
+    payload_hash TEXT PRIMARY KEY,
+    merchant_id  INTEGER,
+    payload_json TEXT NOT NULL,
+    qr_data      TEXT NOT NULL,
+    created_at   REAL NOT NULL,
+    last_used_at REAL NOT NULL
+)
+"""
+
+# Merchant templates learned and verified by emvco_qr.py
+TEMPLATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS qr_templates (
+    merchant_id   INTEGER PRIMARY KEY,
+    template_json TEXT NOT NULL,
+    matched       INTEGER NOT NULL,
+    mismatched    INTEGER NOT NULL,
+    verified      INTEGER NOT NULL,
+    checked_at    REAL NOT NULL
+)
+"""
+
+
+def canonical_payload(payload):
+    """Serialize a payload the same way regardless of key order"""
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def payload_hash(payload, endpoint=QR_ENDPOINT):
+    """Cache key of a payload sent to an endpoint (production keys are the bare payload hash)"""
+    content = canonical_payload(payload)
+    if endpoint != PRODUCTION_QR_URL:
+        content = endpoint + '\n' + content
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class QRCache:
+    """Thread-safe SQLite QR cache (safe to share between processes as well)"""
+
+    def __init__(self, path=CACHE_PATH, ttl_days=TTL_DAYS, max_entries=MAX_ENTRIES, endpoint=QR_ENDPOINT):
+        self.path = path
+        self.endpoint = endpoint
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(SCHEMA)
+        self.conn.execute(TEMPLATE_SCHEMA)
+        self.conn.execute('CREATE INDEX IF NOT EXISTS qr_cache_last_used ON qr_cache (last_used_at)')
+        self.conn.commit()
+
+    def get(self, payload):
+        """Return the cached QR string for a payload, or None"""
+        key = payload_hash(payload, self.endpoint)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT qr_data, created_at FROM qr_cache WHERE payload_hash = ?', (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.conn.execute('UPDATE qr_cache SET last_used_at = ? WHERE payload_hash = ?', (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, payload, qr_data):
+        """Store the QR string returned for a payload"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO qr_cache '
+                '(payload_hash, merchant_id, payload_json, qr_data, created_at, last_used_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (payload_hash(payload, self.endpoint), payload.get('MerchantId'), canonical_payload(payload), qr_data, now, now),
+            )
+            self.conn.commit()
+            self.stores += 1
+
+    def evict(self):
+        """Drop expired entries and the least recently used ones beyond max_entries"""
+        with self.lock:
+            self.conn.execute('DELETE FROM qr_cache WHERE created_at < ?', (time.time() - self.ttl_seconds,))
+            self.conn.execute(
+                'DELETE FROM qr_cache WHERE payload_hash IN ('
+                'SELECT payload_hash FROM qr_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            )
+            self.conn.commit()
+
+    def entries(self, merchant_id=None):
+        """Yield (payload, qr_data) for every cached entry, optionally for one merchant"""
+        query = 'SELECT payload_json, qr_data FROM qr_cache'
+        params = ()
+        if merchant_id is not None:
+            query += ' WHERE merchant_id = ?'
+            params = (merchant_id,)
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        for payload_json, qr_data in rows:
+            yield json.loads(payload_json), qr_data
+
+    def get_template(self, merchant_id):
+        """Return the stored template record for a merchant, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT template_json, matched, mismatched, verified FROM qr_templates WHERE merchant_id = ?',
+                (merchant_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {'template': json.loads(row[0]), 'matched': row[1], 'mismatched': row[2], 'verified': bool(row[3])}
+
+    def put_template(self, merchant_id, template, matched, mismatched, verified):
+        """Store a merchant template with its verification result"""
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO qr_templates '
+                '(merchant_id, template_json, matched, mismatched, verified, checked_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (merchant_id, json.dumps(template), matched, mismatched, int(verified), time.time()),
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide QR cache, or None when disabled or unavailable"""
+    global _cache, ENABLED
+    if not ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = QRCache()
+                _cache.evict()
+            except sqlite3.Error as e:
+                print(f"⚠️ QR cache unavailable, calling the API directly: {str(e)}")
+                ENABLED = False
+                return None
+        return _cache
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+ZwennPay QR Client
+One pooled keep-alive session for the GetMerchantQR endpoint, shared by every
+letter generator. Answers already in the SQLite QR cache (qr_cache.py), or built
+locally for verified merchants with QR_MODE=local (emvco_qr.py), are returned
+without a network call. Calls are retried with jittered exponential
+backoff when the request never reached the server (a read timeout may already
+have created the QR, so it is not sent again), timed into a latency histogram,
+and guarded by a circuit breaker so an endpoint that keeps failing costs one
+fast error per row instead of a full timeout.
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import emvco_qr
+import qr_cache
+
+ZWENNPAY_QR_URL = qr_cache.QR_ENDPOINT  # env ZWENNPAY_QR_URL, production by default
+QR_HEADERS = {"accept": "text/plain", "Content-Type": "application/json"}
+
+CONNECT_TIMEOUT = 5   # seconds to open the connection
+READ_TIMEOUT = float(os.environ.get('QR_TIMEOUT', '20'))  # seconds to wait for the QR
+MAX_RETRIES = 2       # extra attempts after the first one
+BACKOFF_BASE = 0.5    # seconds, doubled per retry
+BACKOFF_MAX = 5.0     # seconds, cap for a single backoff
+POOL_SIZE = 16        # keep-alive connections kept open
+
+BREAKER_THRESHOLD = 5    # consecutive failures that open the circuit
+BREAKER_COOLDOWN = 60.0  # seconds before a single trial call is let through again
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 5000, 10000, float('inf'))
+
+# Status codes worth another attempt
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# Errors worth another attempt: the connection failed (ConnectTimeout included),
+# so the server never saw the request. ReadTimeout is not one of them.
+RETRY_ERRORS = (requests.exceptions.ConnectionError,)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without calling the API while the circuit breaker is open"""
+
+
+class OfflineCacheMiss(requests.exceptions.RequestException):
+    """Raised in offline mode (QR_OFFLINE=1) for a payload that is not cached"""
+
+
+class QRResponse:
+    """The parts of a GetMerchantQR response the generators use"""
+
+    __slots__ = ('status_code', 'text')
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+
+def is_valid_qr_data(text):
+    """True when a response body holds an actual QR string"""
+    qr_data = str(text).strip()
+    return bool(qr_data) and qr_data.lower() not in ('null', 'none', 'nan')
+
+
+class QRClient:
+    """Pooled GetMerchantQR client with retries, latency stats and a circuit breaker"""
+
+    def __init__(self, url=ZWENNPAY_QR_URL):
+        self.url = url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self.histogram = [0] * len(LATENCY_BUCKETS_MS)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.breaker_trips = 0
+        self.offline_misses = 0
+        self.local_builds = 0
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    # -- circuit breaker -------------------------------------------------
+
+    def _check_breaker(self):
+        """Raise CircuitOpenError while the circuit is open; True when this call is the half-open trial"""
+        with self._lock:
+            if not self._open_until:
+                return False
+            now = time.monotonic()
+            if now >= self._open_until and not self._trial_in_flight:
+                # Half-open: exactly one caller probes the endpoint, the others keep failing fast
+                self._trial_in_flight = True
+                return True
+            self.short_circuited += 1
+            detail = f"retrying in {self._open_until - now:.0f}s" if now < self._open_until else "trial call in progress"
+            raise CircuitOpenError(
+                f"QR service unavailable after {self._consecutive_failures} consecutive failures ({detail})"
+            )
+
+    def _end_trial(self):
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _record_outcome(self, ok):
+        with self._lock:
+            if ok:
+                self._consecutive_failures = 0
+                self._open_until = 0.0
+                return
+            self.failures += 1
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= BREAKER_THRESHOLD:
+                if not self._open_until or time.monotonic() >= self._open_until:
+                    self.breaker_trips += 1
+                self._open_until = time.monotonic() + BREAKER_COOLDOWN
+
+    # -- latency stats ---------------------------------------------------
+
+    def _record_latency(self, seconds):
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    self.histogram[i] += 1
+                    break
+
+    def percentile(self, fraction):
+        """Approximate latency percentile in ms (upper bound of the matching bucket)"""
+        total = sum(self.histogram)
+        if not total:
+            return None
+        threshold = fraction * total
+        running = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram):
+            running += count
+            if running >= threshold:
+                return bound
+        return LATENCY_BUCKETS_MS[-1]
+
+    def stats_report(self):
+        """Return a printable summary of QR call latency and failures"""
+        lines = [
+            f"📈 QR API: {self.calls} call(s), {self.retries} retries, {self.failures} failure(s), "
+            f"{self.short_circuited} short-circuited, {self.breaker_trips} breaker trip(s)"
+        ]
+        cache = qr_cache.get_cache()
+        if cache is not None:
+            lines.append(
+                f"   QR cache: {cache.hits} hit(s), {cache.misses} miss(es), {cache.stores} stored"
+                + (f", {self.offline_misses} offline miss(es)" if qr_cache.OFFLINE else "")
+            )
+        if emvco_qr.QR_MODE == 'local':
+            lines.append(f"   Built locally: {self.local_builds}")
+        if sum(self.histogram):
+            p50, p95 = self.percentile(0.5), self.percentile(0.95)
+            lines.append(f"   p50 <= {p50:g} ms, p95 <= {p95:g} ms")
+            lower = 0
+            for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram):
+                if count:
+                    label = f"{lower:g}-{bound:g} ms" if bound != float('inf') else f"> {lower:g} ms"
+                    lines.append(f"   {label:>14}: {count}")
+                lower = bound
+        return '\n'.join(lines)
+
+    # -- API call --------------------------------------------------------
+
+    def cached_response(self, payload):
+        """Return a QRResponse built locally or from the QR cache, or None"""
+        qr_data = emvco_qr.local_qr(payload)
+        if qr_data is not None:
+            with self._lock:
+                self.local_builds += 1
+            return QRResponse(200, qr_data)
+        cache = qr_cache.get_cache()
+        qr_data = cache.get(payload) if cache is not None else None
+        return QRResponse(200, qr_data) if qr_data is not None else None
+
+    def post_merchant_qr(self, payload, check_cache=True):
+        """POST a GetMerchantQR payload and return the response.
+
+        A local or cached answer comes back as a QRResponse without any network I/O
+        (check_cache=False when the caller already looked it up).
+        Connection errors and 429/5xx responses are retried with jittered
+        backoff; a read timeout is not, since the QR may already exist. After
+        all attempts a network error is re-raised and a bad response is
+        returned as-is, exactly like a bare requests.post. The half-open trial
+        after a breaker cooldown makes a single attempt.
+        """
+        cached = self.cached_response(payload) if check_cache else None
+        if cached is not None:
+            return cached
+        if qr_cache.OFFLINE:
+            with self._lock:
+                self.offline_misses += 1
+            raise OfflineCacheMiss("No cached QR for this payload and QR_OFFLINE=1")
+
+        trial = self._check_breaker()
+        try:
+            return self._post_with_retries(payload, 0 if trial else MAX_RETRIES)
+        finally:
+            if trial:
+                self._end_trial()
+
+    def _post_with_retries(self, payload, max_retries):
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            with self._lock:
+                self.calls += 1
+            try:
+                response = self.session.post(
+                    self.url,
+                    headers=QR_HEADERS,
+                    json=payload,
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                )
+            except requests.exceptions.RequestException as e:
+                self._record_latency(time.perf_counter() - started)
+                if not isinstance(e, RETRY_ERRORS) or attempt >= max_retries:
+                    self._record_outcome(False)
+                    raise
+            else:
+                self._record_latency(time.perf_counter() - started)
+                if response.status_code not in RETRY_STATUS or attempt >= max_retries:
+                    self._record_outcome(response.status_code == 200)
+                    cache = qr_cache.get_cache()
+                    if cache is not None and response.status_code == 200 and is_valid_qr_data(response.text):
+                        cache.put(payload, str(response.text).strip())
+                    return response
+
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            # Full jitter: spread retries out so parallel callers do not stampede
+            time.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide QR client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = QRClient()
+        return _client
+
+
+def post_merchant_qr(payload):
+    """POST a GetMerchantQR payload through the shared client"""
+    return get_client().post_merchant_qr(payload)
+
+
+def print_stats():
+    """Print the shared client's latency histogram and cache hits (no output if it was never used)"""
+    if _client is not None:
+        print(_client.stats_report())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+QR Prefetch
+Fetches GetMerchantQR responses ahead of the render loop on a small thread pool,
+so letters are drawn while the next rows' QR codes are already in flight. The
+number of parallel calls is capped, calls are paced by a token bucket, and the
+pace backs off automatically while the API is returning errors.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import qr_client
+
+QR_CONCURRENCY = int(os.environ.get('QR_CONCURRENCY', '8'))        # parallel API calls
+QR_RATE_LIMIT = float(os.environ.get('QR_RATE_LIMIT', '20'))      # calls per second
+PREFETCH_AHEAD = int(os.environ.get('QR_PREFETCH_AHEAD', '64'))   # rows fetched ahead of rendering
+MAX_ERROR_DELAY = 10.0  # seconds, cap for the adaptive back-off
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second with bursts of `rate`"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class QRFetch:
+    """One prefetched QR call; get() returns the response or re-raises its error"""
+
+    __slots__ = ('future',)
+
+    def __init__(self, future):
+        self.future = future
+
+    def get(self):
+        status_code, text, error = self.future.result()
+        if error is not None:
+            raise error
+        return qr_client.QRResponse(status_code, text)
+
+
+class ResolvedQRFetch:
+    """A finished QR call that can be sent to a render worker; get() behaves like QRFetch.get()"""
+
+    __slots__ = ('response', 'error')
+
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+
+    @classmethod
+    def resolve(cls, qr_fetch):
+        """Wait for a QRFetch (None passes through)"""
+        if qr_fetch is None:
+            return None
+        try:
+            return cls(response=qr_fetch.get())
+        except Exception as e:
+            return cls(error=e)
+
+    def get(self):
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class QRPrefetcher:
+    """Bounded, rate-limited pool of GetMerchantQR calls"""
+
+    def __init__(self, max_workers=QR_CONCURRENCY, rate=QR_RATE_LIMIT):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='qr')
+        self.bucket = TokenBucket(rate) if rate > 0 else None
+        self.error_delay = 0.0
+        self.lock = threading.Lock()
+
+    def _adapt(self, ok):
+        # Double the delay on every error, halve it on every success
+        with self.lock:
+            if ok:
+                self.error_delay = self.error_delay / 2 if self.error_delay > 0.05 else 0.0
+            else:
+                self.error_delay = min(MAX_ERROR_DELAY, max(0.25, self.error_delay * 2))
+
+    def _fetch(self, payload):
+        if self.error_delay:
+            time.sleep(self.error_delay)
+        if self.bucket:
+            self.bucket.acquire()
+        try:
+            # submit() already missed the cache for this payload
+            response = qr_client.get_client().post_merchant_qr(payload, check_cache=False)
+        except Exception as e:
+            self._adapt(False)
+            return None, None, e
+        self._adapt(response.status_code == 200)
+        return response.status_code, response.text, None
+
+    def submit(self, payload):
+        """Schedule one call and return its QRFetch (already done for cached QR codes)"""
+        cached = qr_client.get_client().cached_response(payload)
+        if cached is not None:
+            future = Future()
+            future.set_result((cached.status_code, cached.text, None))
+            return QRFetch(future)
+        return QRFetch(self.executor.submit(self._fetch, payload))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def prefetch_in_order(items, payload_for, ahead=PREFETCH_AHEAD, prefetcher=None):
+    """Yield (item, fetch) pairs in input order with QR calls running ahead.
+
+    payload_for(item) returns the GetMerchantQR payload for an item, or None
+    when the item needs no QR call (fetch is then None). Up to `ahead` items
+    are fetched in front of the consumer, so memory stays bounded on any
+    listing size.
+    """
+    owned = prefetcher is None
+    prefetcher = prefetcher or QRPrefetcher()
+    window = deque()
+    try:
+        for item in items:
+            payload = payload_for(item)
+            window.append((item, prefetcher.submit(payload) if payload is not None else None))
+            if len(window) > ahead:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
+    finally:
+        if owned:
+            # Let calls still in flight finish rather than leaving threads behind
+            prefetcher.close()
+
+
+def prefetch_each_in_order(items, payloads_for, ahead=PREFETCH_AHEAD, prefetcher=None):
+    """Like prefetch_in_order for items that need several QR codes.
+
+    payloads_for(item) returns {key: payload}; yields (item, {key: fetch}) in
+    input order. Identical payloads of one item share a single call, and keys
+    whose payload is None get no call (fetch None).
+    """
+    owned = prefetcher is None
+    prefetcher = prefetcher or QRPrefetcher()
+    window = deque()
+    try:
+        for item in items:
+            fetches, submitted = {}, {}
+            for key, payload in payloads_for(item).items():
+                if payload is None:
+                    fetches[key] = None
+                    continue
+                marker = json.dumps(payload, sort_keys=True)
+                if marker not in submitted:
+                    submitted[marker] = prefetcher.submit(payload)
+                fetches[key] = submitted[marker]
+            window.append((item, fetches))
+            if len(window) > ahead:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
+    finally:
+        if owned:
+            prefetcher.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+QR Stamp
+Late-binding payment QR codes. With --late-qr the generators render every letter
+with an empty, reserved QR box and record its page and position in
+<output_dir>/qr_manifest.jsonl; the QR calls run on the prefetch pool while
+rendering continues, and the codes are stamped into the finished PDFs with
+PyMuPDF at the end. Entries that could not be stamped stay in the manifest and
+can be retried later without re-rendering anything.
+
+Usage: python qr_stamp.py <output_dir>
+"""
+
+import json
+import os
+import sys
+
+import fitz  # PyMuPDF
+
+import letter_cache
+import qr_client
+import qr_render
+from qr_prefetch import QRPrefetcher
+
+MANIFEST_NAME = 'qr_manifest.jsonl'
+
+
+def manifest_path(output_dir):
+    return os.path.join(output_dir, MANIFEST_NAME)
+
+
+def read_manifest(output_dir):
+    """Return the manifest entries of an output folder (empty when there is none)"""
+    path = manifest_path(output_dir)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_manifest(output_dir, entries):
+    """Replace the manifest atomically; remove it when nothing is left"""
+    path = manifest_path(output_dir)
+    if not entries:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + '\n')
+    os.replace(path + '.tmp', path)
+
+
+def stamp_qr(entry, qr_data):
+    """Draw the QR code for qr_data into the reserved box of one letter"""
+    doc = fitz.open(entry['pdf'])
+    try:
+        page = doc[entry['page']]
+        page_height = page.rect.height
+        shape = page.new_shape()
+        qr = qr_render.make_qr(qr_data)
+        for x, y, w, h in qr_render.qr_runs(qr, entry['x'], entry['y'], entry['size']):
+            # reportlab measures y from the bottom of the page, PyMuPDF from the top
+            shape.draw_rect(fitz.Rect(x, page_height - y - h, x + w, page_height - y))
+        shape.finish(color=None, fill=(0, 0, 0), width=0)
+        shape.commit()
+        doc.saveIncr()
+    finally:
+        doc.close()
+
+
+def qr_data_from(response):
+    """Return the QR string of a response, or None with the reason printed"""
+    if response.status_code != 200:
+        print(f"❌ API request failed: {response.status_code} - {response.text}")
+        return None
+    qr_data = str(response.text).strip()
+    if not qr_client.is_valid_qr_data(qr_data):
+        print("⚠️ No valid QR data received")
+        return None
+    return qr_data
+
+
+def stamp_entry(entry, qr_fetch):
+    """Wait for one entry's QR and stamp it; return True on success"""
+    try:
+        qr_data = qr_data_from(qr_fetch.get())
+        if qr_data is None:
+            return False
+        stamp_qr(entry, qr_data)
+    except Exception as e:
+        print(f"⚠️ Could not stamp QR into {entry['pdf']}: {str(e)}")
+        return False
+    if entry.get('kind') and entry.get('cache_key'):
+        letter_cache.store_letter(entry['kind'], entry['cache_key'], entry['pdf'])
+    return True
+
+
+class QRStamper:
+    """Collects reserved QR boxes while letters render, then stamps them"""
+
+    def __init__(self, output_dir, prefetcher=None):
+        self.output_dir = output_dir
+        self.prefetcher = prefetcher or QRPrefetcher()
+        self.pending = []
+        # Start from a clean manifest; entries are appended as letters render
+        write_manifest(output_dir, [])
+
+    def add(self, pdf_filename, slot, payload, kind=None, cache_key=None):
+        """Record a rendered letter's QR box and start fetching its QR"""
+        if slot.page is None:
+            return  # The letter layout never reached the QR
+        entry = {
+            'pdf': pdf_filename,
+            'page': slot.page,
+            'x': slot.x,
+            'y': slot.y,
+            'size': slot.size,
+            'payload': payload,
+            'kind': kind,
+            'cache_key': cache_key,
+        }
+        with open(manifest_path(self.output_dir), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self.pending.append((entry, self.prefetcher.submit(payload)))
+
+    def finish(self):
+        """Stamp every pending QR; keep failures in the manifest. Returns (stamped, failed)"""
+        try:
+            failed = [entry for entry, qr_fetch in self.pending if not stamp_entry(entry, qr_fetch)]
+        finally:
+            self.prefetcher.close()
+        write_manifest(self.output_dir, failed)
+        stamped = len(self.pending) - len(failed)
+        self.pending = []
+        return stamped, len(failed)
+
+
+class DeferredStamps:
+    """Stands in for a QRStamper inside a render worker process.
+
+    add() calls are only recorded; the parent replays them on its real
+    stamper, which owns the manifest and the QR fetches.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def add(self, pdf_filename, slot, payload, kind=None, cache_key=None):
+        self.calls.append((pdf_filename, slot, payload, kind, cache_key))
+
+    def replay(self, stamper):
+        for call in self.calls:
+            stamper.add(*call)
+
+
+def stamp_manifest(output_dir):
+    """Retry every entry left in an output folder's manifest. Returns (stamped, failed)"""
+    entries = read_manifest(output_dir)
+    with QRPrefetcher() as prefetcher:
+        fetches = [(entry, prefetcher.submit(entry['payload'])) for entry in entries]
+        failed = [entry for entry, qr_fetch in fetches if not stamp_entry(entry, qr_fetch)]
+    write_manifest(output_dir, failed)
+    return len(entries) - len(failed), len(failed)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python qr_stamp.py <output_dir>")
+        sys.exit(1)
+
+    stamped, failed = stamp_manifest(sys.argv[1])
+    print(f"🔳 Stamped {stamped} QR code(s), {failed} left in {manifest_path(sys.argv[1])}")
+    qr_client.print_stats()
+    sys.exit(1 if failed else 0)
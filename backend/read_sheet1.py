@@ -1,6 +1,7 @@
-import pandas as pd
 import os
 
+from listing_summary import listing_keys_and_names, load_summary
+
 file_path = r'C:\Users\Ryan EZ\OneDrive - EZ DASH LTD\Documents\letters_Motors_health\backend\RENEWAL_LISTING.xlsx'
 
 print(f"Reading Sheet1 from: {file_path}")
@@ -9,30 +10,30 @@ print(f"File exists: {os.path.exists(file_path)}")
 if os.path.exists(file_path):
     try:
         # Read specifically from Sheet1
-        df_sheet1 = pd.read_excel(file_path, sheet_name='Sheet1', engine='openpyxl')
+        summary = load_summary(file_path, preferred_sheet='Sheet1', kind='health')
         
         print(f"\n=== SHEET1 ANALYSIS ===")
-        print(f"Total rows in Sheet1: {len(df_sheet1)}")
+        print(f"Total rows in Sheet1: {summary['rows']}")
         
-        if 'POL_NO' in df_sheet1.columns:
+        if summary['key_column'] == 'POL_NO':
             # Count valid policy numbers (non-null)
-            valid_policies = df_sheet1['POL_NO'].notna().sum()
+            valid_policies = summary['valid_keys']
             print(f"Valid policy numbers in Sheet1: {valid_policies}")
             
-            # Show the policy numbers
-            valid_df = df_sheet1[df_sheet1['POL_NO'].notna()]
+            # Show the policy numbers (row values come from the Parquet sidecar)
+            keys, names = listing_keys_and_names(file_path, 'Sheet1', 'health', summary['sha256'])
             print(f"\nPolicy numbers found in Sheet1:")
-            for i, pol in enumerate(valid_df['POL_NO'], 1):
+            for i, pol in enumerate(keys, 1):
                 print(f"{i}. {pol}")
                 
             # Show names too
-            if 'NAME' in df_sheet1.columns and 'SURNAME' in df_sheet1.columns:
+            if 'NAME' in summary['columns'] and 'SURNAME' in summary['columns']:
                 print(f"\nCustomer names in Sheet1:")
-                for i, (name, surname) in enumerate(zip(valid_df['NAME'], valid_df['SURNAME']), 1):
-                    print(f"{i}. {name} {surname}")
+                for i, name in enumerate(names, 1):
+                    print(f"{i}. {name}")
         else:
             print("POL_NO column not found in Sheet1")
-            print(f"Available columns in Sheet1: {list(df_sheet1.columns)}")
+            print(f"Available columns in Sheet1: {summary['columns']}")
             
     except Exception as e:
         print(f"Error reading Sheet1: {e}")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Render Pool
+Spreads letter rendering across worker processes. Jobs are submitted in input
+order through a bounded window and their results come back in that same order,
+so file names, logs and reports stay deterministic whatever the worker count.
+Each worker runs its initializer once (fonts, logos) and then renders many
+letters. A job's progress lines are captured in the worker and printed by the
+parent with its result, so output from several workers never interleaves.
+Per-worker status counts are rolled up into one report.
+"""
+
+import io
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+JOBS_AHEAD_PER_WORKER = 4  # queued jobs per worker, bounds memory on any listing size
+
+
+def resolve_workers(value):
+    """Worker count from a --workers value; 0 or 'auto' means one per CPU"""
+    if str(value).lower() in ('0', 'auto'):
+        return os.cpu_count() or 1
+    return max(1, int(value))
+
+
+def _run_job(render, job):
+    """Runs in a worker: render one job, returning the worker's pid, the job's printed output and its result"""
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            result = render(*job)
+    except BaseException:
+        # The parent only sees the exception, so the job's lines go out here in one write
+        sys.stdout.write(output.getvalue())
+        sys.stdout.flush()
+        raise
+    return os.getpid(), output.getvalue(), result
+
+
+class RenderPool:
+    """Process pool that renders jobs in order and counts each worker's outcomes.
+
+    render(*job) must be a module-level function returning (status, result);
+    status is a short word such as 'generated', 'reused' or 'failed'.
+    """
+
+    def __init__(self, workers, initializer=None):
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=initializer)
+        self.counts = {}  # worker pid -> Counter of statuses
+
+    def _collect(self, future):
+        try:
+            pid, output, (status, result) = future.result()
+            sys.stdout.write(output)
+        except Exception as e:
+            print(f"❌ Render worker failed: {str(e)}")
+            pid, status, result = None, 'failed', None
+        self.counts.setdefault(pid, Counter())[status] += 1
+        return result
+
+    def map(self, render, jobs):
+        """Yield each job's result in job order while later jobs render"""
+        window = deque()
+        ahead = self.workers * JOBS_AHEAD_PER_WORKER
+        for job in jobs:
+            window.append(self.executor.submit(_run_job, render, job))
+            if len(window) >= ahead:
+                yield self._collect(window.popleft())
+        while window:
+            yield self._collect(window.popleft())
+
+    def totals(self):
+        total = Counter()
+        for counts in self.counts.values():
+            total.update(counts)
+        return total
+
+    def print_report(self):
+        """One line per worker and a total"""
+        def describe(counts):
+            return ', '.join(f"{counts[status]} {status}" for status in sorted(counts))
+
+        print(f"🧵 Rendered on {self.workers} worker process(es):")
+        for worker, (pid, counts) in enumerate(sorted(self.counts.items(), key=lambda item: item[0] or 0), 1):
+            label = f"worker {worker} (pid {pid})" if pid is not None else "lost jobs"
+            print(f"   {label}: {describe(counts)}")
+        print(f"   total: {describe(self.totals())}")
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
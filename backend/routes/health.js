@@ -58,6 +58,7 @@ router.post('/upload-excel', healthUpload.single('file'), async (req, res) => {
 
     // Count records in Excel file - simplified approach with detailed logging
     let recordCount = 0;
+    let summary = null;
     try {
       console.log(`🔍 Starting health record count for: ${req.file.originalname}`);
       console.log(`📁 Upload path: ${req.file.path}`);
@@ -70,79 +71,48 @@ router.post('/upload-excel', healthUpload.single('file'), async (req, res) => {
         console.log('❌ Uploaded file not found');
         recordCount = 0;
       } else {
-        // Try a simpler approach - use Node.js to read Excel from Sheet1
+        // Summarize Sheet1 (or the first sheet) in one parse - this also writes the Parquet
+        // sidecar and summary JSON that the generator and diagnostics reuse for this file
         try {
+          const summaryScript = path.join(__dirname, '../listing_summary.py');
+          const { execSync } = await import('child_process');
+          const result = execSync(`python "${summaryScript}" "${req.file.path}" --sheet Sheet1`, {
+            encoding: 'utf8',
+            cwd: path.dirname(summaryScript),
+            timeout: 60000
+          });
+
+          console.log(`🐍 Listing summary result: ${result.trim()}`);
+
+          const match = result.match(/SUCCESS:(\d+)/);
+          if (!match) {
+            throw new Error(result.trim());
+          }
+          recordCount = parseInt(match[1]) || 0;
+
+          const summaryMatch = result.match(/^SUMMARY:(.*)$/m);
+          if (summaryMatch) {
+            summary = JSON.parse(summaryMatch[1]);
+          }
+          console.log(`📊 Health records counted via listing summary: ${recordCount}`);
+        } catch (summaryError) {
+          console.log('📊 Listing summary failed, trying xlsx fallback...');
+          console.error('Listing summary error:', summaryError.message);
+
+          // Fallback to Node.js xlsx count from Sheet1 (or the first sheet)
           const XLSX = await import('xlsx');
           const workbook = XLSX.default.readFile(req.file.path);
-          
-          // Look for Sheet1 specifically, fallback to first sheet if not found
+
           let sheetName = 'Sheet1';
           if (!workbook.SheetNames.includes('Sheet1')) {
             sheetName = workbook.SheetNames[0];
             console.log(`⚠️ Sheet1 not found, using ${sheetName} instead`);
-          } else {
-            console.log(`✅ Reading from Sheet1`);
           }
-          
+
           const worksheet = workbook.Sheets[sheetName];
           const jsonData = XLSX.default.utils.sheet_to_json(worksheet);
           recordCount = jsonData.length;
           console.log(`📊 Health records counted via xlsx from ${sheetName}: ${recordCount}`);
-        } catch (xlsxError) {
-          console.log('📊 xlsx method failed, trying Python fallback...');
-          console.error('xlsx error:', xlsxError.message);
-          
-          // Fallback to Python method with better error handling
-          const targetPath = path.join(__dirname, '../RENEWAL_LISTING.xlsx');
-          await fs.copy(req.file.path, targetPath);
-          
-          const countScript = path.join(__dirname, '../count_health_records.py');
-          const scriptContent = `
-import pandas as pd
-import sys
-import traceback
-
-try:
-    # Check available sheets first
-    excel_file = pd.ExcelFile('RENEWAL_LISTING.xlsx')
-    print(f"Available sheets: {excel_file.sheet_names}")
-    
-    # Read from Sheet1 if it exists, otherwise use default (first sheet)
-    if 'Sheet1' in excel_file.sheet_names:
-        df = pd.read_excel('RENEWAL_LISTING.xlsx', sheet_name='Sheet1')
-        print(f"Reading from Sheet1")
-    else:
-        df = pd.read_excel('RENEWAL_LISTING.xlsx')
-        print(f"Sheet1 not found, reading from default sheet")
-    
-    count = len(df)
-    print(f"SUCCESS:{count}")
-except Exception as e:
-    print(f"ERROR:{str(e)}")
-    traceback.print_exc()
-`;
-          
-          await fs.writeFile(countScript, scriptContent);
-          
-          const { execSync } = await import('child_process');
-          const result = execSync(`python "${countScript}"`, { 
-            encoding: 'utf8',
-            cwd: path.dirname(countScript),
-            timeout: 10000
-          });
-          
-          console.log(`🐍 Python result: ${result.trim()}`);
-          
-          if (result.startsWith('SUCCESS:')) {
-            recordCount = parseInt(result.split(':')[1]) || 0;
-          } else {
-            console.error('Python counting failed:', result);
-            recordCount = 0;
-          }
-          
-          // Clean up temporary files
-          await fs.remove(countScript);
-          await fs.remove(targetPath);
         }
       }
       
@@ -158,7 +128,8 @@ except Exception as e:
       filename: req.file.filename,
       originalName: req.file.originalname,
       size: req.file.size,
-      recordCount: recordCount
+      recordCount: recordCount,
+      summary: summary
     });
 
   } catch (error) {
@@ -58,6 +58,7 @@ router.post('/upload-excel', motorUpload.single('file'), async (req, res) => {
 
     // Count records in Excel file - simplified approach with detailed logging
     let recordCount = 0;
+    let summary = null;
     try {
       console.log(`🔍 Starting record count for: ${req.file.originalname}`);
       console.log(`📁 Upload path: ${req.file.path}`);
@@ -70,59 +71,42 @@ router.post('/upload-excel', motorUpload.single('file'), async (req, res) => {
         console.log('❌ Uploaded file not found');
         recordCount = 0;
       } else {
-        // Try a simpler approach - use Node.js to read Excel
+        // Summarize the workbook in one parse - this also writes the Parquet sidecar
+        // and summary JSON that the generator and diagnostics reuse for this file
         try {
-          const XLSX = await import('xlsx');
-          const workbook = XLSX.default.readFile(req.file.path);
-          const sheetName = workbook.SheetNames[0];
-          const worksheet = workbook.Sheets[sheetName];
-          const jsonData = XLSX.default.utils.sheet_to_json(worksheet);
-          recordCount = jsonData.length;
-          console.log(`📊 Records counted via xlsx: ${recordCount}`);
-        } catch (xlsxError) {
-          console.log('📊 xlsx method failed, trying Python fallback...');
-          console.error('xlsx error:', xlsxError.message);
-
-          // Fallback to Python method with better error handling
-          const targetPath = path.join(__dirname, '../output_motor_renewal.xlsx');
-          await fs.copy(req.file.path, targetPath);
-
-          const countScript = path.join(__dirname, '../count_records.py');
-          const scriptContent = `
-import pandas as pd
-import sys
-import traceback
-
-try:
-    df = pd.read_excel('output_motor_renewal.xlsx')
-    count = len(df)
-    print(f"SUCCESS:{count}")
-except Exception as e:
-    print(f"ERROR:{str(e)}")
-    traceback.print_exc()
-`;
-
-          await fs.writeFile(countScript, scriptContent);
-
+          const summaryScript = path.join(__dirname, '../listing_summary.py');
           const { execSync } = await import('child_process');
-          const result = execSync(`python "${countScript}"`, {
+          const result = execSync(`python "${summaryScript}" "${req.file.path}"`, {
             encoding: 'utf8',
-            cwd: path.dirname(countScript),
-            timeout: 10000
+            cwd: path.dirname(summaryScript),
+            timeout: 60000
           });
 
-          console.log(`🐍 Python result: ${result.trim()}`);
+          console.log(`🐍 Listing summary result: ${result.trim()}`);
 
-          if (result.startsWith('SUCCESS:')) {
-            recordCount = parseInt(result.split(':')[1]) || 0;
-          } else {
-            console.error('Python counting failed:', result);
-            recordCount = 0;
+          const match = result.match(/SUCCESS:(\d+)/);
+          if (!match) {
+            throw new Error(result.trim());
           }
+          recordCount = parseInt(match[1]) || 0;
 
-          // Clean up temporary files
-          await fs.remove(countScript);
-          await fs.remove(targetPath);
+          const summaryMatch = result.match(/^SUMMARY:(.*)$/m);
+          if (summaryMatch) {
+            summary = JSON.parse(summaryMatch[1]);
+          }
+          console.log(`📊 Records counted via listing summary: ${recordCount}`);
+        } catch (summaryError) {
+          console.log('📊 Listing summary failed, trying xlsx fallback...');
+          console.error('Listing summary error:', summaryError.message);
+
+          // Fallback to Node.js xlsx count
+          const XLSX = await import('xlsx');
+          const workbook = XLSX.default.readFile(req.file.path);
+          const sheetName = workbook.SheetNames[0];
+          const worksheet = workbook.Sheets[sheetName];
+          const jsonData = XLSX.default.utils.sheet_to_json(worksheet);
+          recordCount = jsonData.length;
+          console.log(`📊 Records counted via xlsx: ${recordCount}`);
         }
       }
 
@@ -140,7 +124,8 @@ except Exception as e:
       filename: req.file.filename,
       originalName: req.file.originalname,
       size: req.file.size,
-      recordCount: recordCount
+      recordCount: recordCount,
+      summary: summary
     });
 
   } catch (error) {
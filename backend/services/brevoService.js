@@ -41,6 +41,11 @@ try {
   }
 
   apiInstance = new SibApiV3Sdk.TransactionalEmailsApi();
+  if (process.env.BREVO_API_BASE_URL) {
+    // e.g. the local stub server (python -m stubs.server) for load tests
+    apiInstance.basePath = process.env.BREVO_API_BASE_URL;
+    console.log(`🧪 Brevo API base URL overridden: ${process.env.BREVO_API_BASE_URL}`);
+  }
   console.log('✅ Brevo API initialized successfully');
 } catch (error) {
   console.error('❌ Brevo API initialization error:', error);
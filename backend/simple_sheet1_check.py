@@ -1,17 +1,18 @@
-import pandas as pd
+from listing_summary import listing_keys_and_names, load_summary
 
 try:
     # Read Sheet1 from RENEWAL_LISTING.xlsx in current directory
-    df = pd.read_excel('RENEWAL_LISTING.xlsx', sheet_name='Sheet1')
+    summary = load_summary('RENEWAL_LISTING.xlsx', preferred_sheet='Sheet1', kind='health')
     
-    print(f"Sheet1 contains {len(df)} rows")
+    print(f"Sheet1 contains {summary['rows']} rows")
     
-    if 'POL_NO' in df.columns:
-        valid_policies = df['POL_NO'].notna().sum()
+    if summary['key_column'] == 'POL_NO':
+        valid_policies = summary['valid_keys']
         print(f"Valid policy numbers: {valid_policies}")
         
-        # Show the policies
-        for i, pol in enumerate(df[df['POL_NO'].notna()]['POL_NO'], 1):
+        # Show the policies (row values come from the Parquet sidecar)
+        keys, _ = listing_keys_and_names('RENEWAL_LISTING.xlsx', 'Sheet1', 'health', summary['sha256'])
+        for i, pol in enumerate(keys, 1):
             print(f"{i}. {pol}")
     else:
         print("No POL_NO column found")
@@ -0,0 +1,5 @@
+"""
+Offline stand-ins for the ZwennPay GetMerchantQR endpoint and the Brevo
+transactional email API, for load and throughput runs without network access.
+Start with `python -m stubs.server` from the backend directory.
+"""
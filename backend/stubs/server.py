@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+API Stub Server
+Serves GetMerchantQR and Brevo's POST /v3/smtp/email from one local port, with a
+configurable latency distribution, error rate and rate limit per API, so the
+generators and the email sender can be load-tested on an isolated box.
+
+Point the system at it with:
+  ZWENNPAY_QR_URL=http://127.0.0.1:8787/api/v1.0/Common/GetMerchantQR   (Python generators)
+  BREVO_API_BASE_URL=http://127.0.0.1:8787/v3                            (services/brevoService.js)
+
+Latency specs (milliseconds): fixed:80, uniform:50,200, normal:120,30,
+lognormal:120,0.6 (median, sigma), exponential:100 (mean).
+
+Usage: python -m stubs.server [--port 8787] [--qr-latency lognormal:120,0.6]
+       [--qr-error-rate 0.01] [--qr-rate-limit 50] [--brevo-latency ...]
+       [--brevo-error-rate ...] [--brevo-rate-limit ...]
+GET /__stats returns request counts per API as JSON.
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import emvco_qr
+
+QR_PATH = '/api/v1.0/Common/GetMerchantQR'
+BREVO_EMAIL_PATH = '/v3/smtp/email'
+
+# Static merchant fields the stub answers with (real values come from ZwennPay)
+STUB_TEMPLATE = [
+    ['00', '01'],
+    ['01', '11'],
+    ['26', '0012mu.zwennpay0110stub000000'],
+    ['52', '6300'],
+    ['53', '480'],
+    ['58', 'MU'],
+    ['59', 'NIC STUB MERCHANT'],
+    ['60', 'PORT LOUIS'],
+]
+
+
+def parse_latency(spec):
+    """Return a function giving one latency sample in seconds for a spec like 'lognormal:120,0.6'"""
+    kind, _, args = spec.partition(':')
+    values = [float(v) for v in args.split(',')] if args else []
+    if kind == 'fixed':
+        sample = lambda: values[0]
+    elif kind == 'uniform':
+        sample = lambda: random.uniform(values[0], values[1])
+    elif kind == 'normal':
+        sample = lambda: random.gauss(values[0], values[1])
+    elif kind == 'lognormal':
+        sample = lambda: random.lognormvariate(math.log(values[0]), values[1])
+    elif kind == 'exponential':
+        sample = lambda: random.expovariate(1.0 / values[0])
+    else:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    return lambda: max(0.0, sample()) / 1000.0
+
+
+class RateLimiter:
+    """Non-blocking token bucket; allow() is False once the per-second budget is spent"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = max(rate, 1.0)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self):
+        if self.rate <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class StubAPI:
+    """Behaviour and counters of one stubbed API"""
+
+    def __init__(self, name, latency, error_rate, rate_limit, error_status):
+        self.name = name
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.limiter = RateLimiter(rate_limit)
+        self.error_status = error_status
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0}
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def outcome(self):
+        """Sleep for one latency sample and return the status to answer with (None for success)"""
+        self.count('requests')
+        if not self.limiter.allow():
+            self.count('rate_limited')
+            return 429
+        time.sleep(self.latency())
+        if random.random() < self.error_rate:
+            self.count('errors')
+            return self.error_status
+        self.count('ok')
+        return None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real endpoints
+    apis = {}
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate a load run
+
+    def _send(self, status, body, content_type='application/json'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        if self.path == '/__stats':
+            self._send(200, json.dumps({name: api.counts for name, api in self.apis.items()}))
+        else:
+            self._send(404, '{"message": "Not found"}')
+
+    def do_POST(self):
+        if self.path == QR_PATH:
+            self._merchant_qr()
+        elif self.path == BREVO_EMAIL_PATH:
+            self._brevo_email()
+        else:
+            self._read_json()
+            self._send(404, '{"message": "Not found"}')
+
+    def _merchant_qr(self):
+        payload = self._read_json()
+        if payload is None:
+            self._send(400, 'Invalid JSON', 'text/plain')
+            return
+        status = self.apis['zwennpay'].outcome()
+        if status:
+            self._send(status, 'Service unavailable' if status != 429 else 'Too many requests', 'text/plain')
+        else:
+            try:
+                self._send(200, emvco_qr.build_qr_string(payload, STUB_TEMPLATE), 'text/plain')
+            except ValueError as e:
+                self._send(400, str(e), 'text/plain')
+
+    def _brevo_email(self):
+        message = self._read_json()
+        if not self.headers.get('api-key'):
+            self._send(401, '{"code": "unauthorized", "message": "Key not found"}')
+            return
+        if message is None or not message.get('to'):
+            self._send(400, '{"code": "missing_parameter", "message": "to is missing"}')
+            return
+        status = self.apis['brevo'].outcome()
+        if status == 429:
+            self._send(429, '{"code": "too_many_requests", "message": "Rate limit exceeded"}')
+        elif status:
+            self._send(status, '{"code": "internal_error", "message": "Stub error"}')
+        else:
+            self._send(201, json.dumps({'messageId': f"<{uuid.uuid4()}@stub.brevo>"}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local ZwennPay and Brevo stand-in server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--qr-latency', default='lognormal:120,0.5')
+    parser.add_argument('--qr-error-rate', type=float, default=0.0)
+    parser.add_argument('--qr-rate-limit', type=float, default=0, help='requests per second, 0 for none')
+    parser.add_argument('--brevo-latency', default='lognormal:250,0.5')
+    parser.add_argument('--brevo-error-rate', type=float, default=0.0)
+    parser.add_argument('--brevo-rate-limit', type=float, default=0, help='requests per second, 0 for none')
+    parser.add_argument('--seed', type=int, help='seed latency and error sampling for repeatable runs')
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    StubHandler.apis = {
+        'zwennpay': StubAPI('zwennpay', args.qr_latency, args.qr_error_rate, args.qr_rate_limit, 503),
+        'brevo': StubAPI('brevo', args.brevo_latency, args.brevo_error_rate, args.brevo_rate_limit, 500),
+    }
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+    print(f"🧪 Stub server on http://{args.host}:{args.port}")
+    print(f"   ZWENNPAY_QR_URL=http://{args.host}:{args.port}{QR_PATH}")
+    print(f"   BREVO_API_BASE_URL=http://{args.host}:{args.port}/v3")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
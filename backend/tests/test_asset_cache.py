@@ -0,0 +1,27 @@
+import io
+import os
+
+from reportlab import rl_config
+from reportlab.pdfgen import canvas
+
+import asset_cache
+from conftest import BACKEND_DIR
+
+LOGO = os.path.join(BACKEND_DIR, 'NICLOGO.jpg')
+
+
+def test_logos_are_embedded_as_binary_without_changing_the_global_setting():
+    use_a85 = rl_config.useA85
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    asset_cache.draw_image(c, LOGO, 72, 72, width=100, height=50)
+    assert rl_config.useA85 == use_a85
+    c.save()
+    assert b'/Filter [ /DCTDecode ]' in buffer.getvalue()
+    assert b'/ASCII85Decode /DCTDecode' not in buffer.getvalue()
+
+
+def test_image_size_is_measured_once():
+    asset = asset_cache.image(LOGO)
+    assert asset_cache.image(LOGO) is asset
+    assert asset.getSize() == (asset.width, asset.height) and asset.width > 0
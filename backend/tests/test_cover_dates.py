@@ -0,0 +1,25 @@
+import pandas as pd
+
+from cover_dates import detect_date_format, resolve_cover_dates
+
+
+def test_detects_the_format_of_a_column():
+    assert detect_date_format(['03/12/2025 23:59:00', '15/01/2026 23:59:00']) == '%d/%m/%Y %H:%M:%S'
+    assert detect_date_format(['2025-12-03', '2026-01-15']) == '%Y-%m-%d'
+    assert detect_date_format(['03 Dec 2025']) == '%d %b %Y'
+
+
+def test_detection_picks_the_format_most_values_match():
+    assert detect_date_format(['03-12-2025', '15-01-2026', '2025-12-03', 'soon']) == '%d-%m-%Y'
+    assert detect_date_format(['soon', '']) is None
+
+
+def test_resolves_mixed_formats_and_reports_unparseable_values():
+    cover_end = pd.Series(['2025-12-03 23:59:00', '03 December 2025', '', 'soon', '2025-12-03 23:59:00'], dtype=object)
+    dates, report = resolve_cover_dates(cover_end)
+    assert dates['parsed'].tolist() == [True, True, False, False, True]
+    assert dates.loc[0, ['expiry_date', 'renewal_start', 'renewal_end']].tolist() == [
+        '03-December-2025', '04-December-2025', '03-December-2026',
+    ]
+    assert dates.loc[1, 'renewal_end'] == '03-December-2026'
+    assert report == [(3, 'soon')]
@@ -0,0 +1,54 @@
+import pytest
+
+from emvco_qr import build_qr_string, crc16, learn_template, parse_tlv, tlv
+
+# Static merchant part of a GetMerchantQR answer (made-up account data)
+STATIC_FIELDS = [('00', '01'), ('01', '12'), ('26', tlv('00', 'mu.maucas') + tlv('01', 'NICL0155')),
+                 ('52', '6300'), ('53', '480'), ('58', 'MU'), ('59', 'NIC General'), ('60', 'Port Louis')]
+PAYLOAD = {
+    'MerchantId': 155,
+    'SetAdditionalBillNumber': True, 'AdditionalBillNumber': 'P.2025..1',
+    'SetAdditionalMobileNo': False, 'AdditionalMobileNo': '',
+    'SetAdditionalCustomerLabel': True, 'AdditionalCustomerLabel': 'P Ramsamy',
+    'SetAdditionalPurposeTransaction': True, 'AdditionalPurposeTransaction': 'NICMotor',
+}
+
+
+def with_crc(body):
+    body += '6304'
+    return body + crc16(body)
+
+
+def test_crc16_is_ccitt_false():
+    assert crc16('123456789') == '29B1'
+    assert crc16('') == 'FFFF'
+
+
+def test_tlv_round_trip():
+    assert tlv('59', 'NIC General') == '5911NIC General'
+    assert parse_tlv('000201' + '5911NIC General') == [('00', '01'), ('59', 'NIC General')]
+    with pytest.raises(ValueError):
+        tlv('62', 'x' * 100)
+    with pytest.raises(ValueError):
+        parse_tlv('5911NIC')
+
+
+def test_builds_the_api_answer_from_its_learned_template():
+    additional = tlv('01', 'P.2025..1') + tlv('06', 'P Ramsamy') + tlv('08', 'NICMotor')
+    api_answer = with_crc(''.join(tlv(tag, value) for tag, value in STATIC_FIELDS) + tlv('62', additional))
+    assert build_qr_string(PAYLOAD, learn_template(api_answer)) == api_answer
+
+
+def test_dynamic_fields_go_in_tag_order():
+    payload = dict(PAYLOAD, SetTransactionAmount=True, TransactionAmount=1250.50)
+    tags = [tag for tag, _ in parse_tlv(build_qr_string(payload, [list(field) for field in STATIC_FIELDS]))]
+    assert tags == ['00', '01', '26', '52', '53', '54', '58', '59', '60', '62', '63']
+    assert dict(parse_tlv(build_qr_string(payload, STATIC_FIELDS)))['54'] == '1250.5'
+
+
+def test_required_fields_ask_the_customer():
+    payload = dict(PAYLOAD, SetAdditionalMobileNo=True, AdditionalRequiredMobileNo=True)
+    qr = build_qr_string(payload, [list(field) for field in STATIC_FIELDS])
+    additional = dict(parse_tlv(qr))['62']
+    assert dict(parse_tlv(additional))['02'] == '***'
+    assert qr[-4:] == crc16(qr[:-4])
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from conftest import BACKEND_DIR
+from healthcare_renewal_final import validate_listing
+
+
+def test_importing_the_engine_does_not_load_pymupdf():
+    code = "import sys, healthcare_renewal_final; print('fitz' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout == 'False\n'
+
+
+def test_template_fingerprint_does_not_depend_on_the_working_directory(tmp_path):
+    code = f"import sys; sys.path.insert(0, {BACKEND_DIR!r}); import healthcare_renewal_final as h; print(h.HEALTH_TEMPLATE)"
+    here = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    elsewhere = subprocess.run([sys.executable, '-c', code], cwd=str(tmp_path), capture_output=True, text=True, check=True)
+    assert here.stdout == elsewhere.stdout
+
+
+def test_validate_listing_streams_accepted_rows_and_reports_the_rest(tmp_path):
+    rows = [{'POL_NO': 'HS/1', 'NAME': 'Anna'}, {'POL_NO': float('nan'), 'NAME': 'Ben'}, {'POL_NO': 'HS/3', 'NAME': 'Chloe'}]
+    accepted_rows, reject_report = validate_listing(iter(rows), str(tmp_path))
+    assert reject_report.rejects == 0  # nothing is read before the rows are consumed
+    assert [(number, row['NAME']) for number, row in accepted_rows] == [(1, 'Anna'), (3, 'Chloe')]
+    assert reject_report.rejects == 1
+    assert reject_report.close() == str(tmp_path / 'rejected_rows.csv')
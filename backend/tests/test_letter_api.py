@@ -0,0 +1,10 @@
+import subprocess
+import sys
+
+from conftest import BACKEND_DIR
+
+
+def test_importing_letter_api_does_not_run_a_generator_script():
+    code = "import sys, letter_api; print(sorted(m for m in sys.modules if m.endswith('_Renewal') or m.startswith('Motor_')))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout == '[]\n'
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+import pandas as pd
+
+from letter_cache import letter_key, normalize_value, normalized_fields
+from qr_cache import PRODUCTION_QR_URL
+
+STUB_URL = 'http://127.0.0.1:8787/api/v1.0/Common/GetMerchantQR'
+FIELDS = {'POL_NO': 'HS/1', 'NAME': 'Anna'}
+PAYLOAD = {'MerchantId': 153, 'AdditionalBillNumber': 'HS.1'}
+
+
+def test_letter_key_depends_on_qr_endpoint():
+    production = letter_key('health', FIELDS, PAYLOAD, 'template', PRODUCTION_QR_URL)
+    stub = letter_key('health', FIELDS, PAYLOAD, 'template', STUB_URL)
+    assert production != stub
+
+
+def test_letter_key_is_stable_for_the_same_inputs():
+    assert letter_key('motor', FIELDS, PAYLOAD, 't') == letter_key('motor', dict(FIELDS), dict(PAYLOAD), 't')
+    assert letter_key('motor', FIELDS, PAYLOAD, 't') != letter_key('health', FIELDS, PAYLOAD, 't')
+
+
+def test_cells_normalize_the_same_however_the_listing_was_read():
+    # Workbook stream (openpyxl), pandas and Parquet sidecar spellings of one row
+    workbook = {'POL_NO': 'HS/1 ', 'MOB_NO': 57000001, 'PREMIUM': 1250.5, 'END_DATE': datetime(2025, 12, 3), 'NOTE': float('nan')}
+    frame = {'POL_NO': 'HS/1', 'MOB_NO': 57000001.0, 'PREMIUM': 1250.5, 'END_DATE': pd.Timestamp('2025-12-03'), 'NOTE': None}
+    assert normalized_fields(workbook) == normalized_fields(frame)
+    assert normalized_fields(frame)['MOB_NO'] == '57000001'
+    assert normalize_value(pd.NaT) == '' and normalize_value(True) == 'True'
+    assert letter_key('health', normalized_fields(workbook), PAYLOAD, 't') == letter_key('health', normalized_fields(frame), PAYLOAD, 't')
@@ -0,0 +1,41 @@
+import math
+
+import pytest
+
+import listing_cache
+from listing_reader import open_listing
+from test_listing_reader import write_workbook
+
+pytest.importorskip('pyarrow')
+
+
+def test_cached_listing_streams_the_same_rows_as_the_workbook(tmp_path, monkeypatch):
+    monkeypatch.setattr(listing_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(listing_cache, 'STREAM_BATCH_ROWS', 2)
+    path = write_workbook(tmp_path / 'listing.xlsx', [
+        ('POL_NO', 'NAME', 'TOTAL_PREMIUM'),
+        ('HS/1', 'Anna', 1200.5),
+        ('HS/2', None, 800),
+        (None, None, None),
+        ('HS/4', 'Ravi', 950),
+        ('HS/5', 'Meera', None),
+    ])
+    listing_cache.load_listing(path, 'Sheet1')
+
+    info, rows = listing_cache.open_cached_listing(path)
+    rows = list(rows)
+    _, workbook_rows = open_listing(path)
+    assert info['from_cache'] and info['estimated_rows'] == 5 and info['has_rows']
+    assert info['columns'] == ['POL_NO', 'NAME', 'TOTAL_PREMIUM']
+    assert len(rows) == 5
+    for cached, parsed in zip(rows, workbook_rows):
+        assert cached.keys() == parsed.keys()
+        for column, value in cached.items():
+            assert value == parsed[column] or (math.isnan(value) and math.isnan(parsed[column]))
+
+
+def test_listing_without_a_sidecar_is_read_from_the_workbook(tmp_path, monkeypatch):
+    monkeypatch.setattr(listing_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    path = write_workbook(tmp_path / 'listing.xlsx', [('POL_NO',), ('HS/1',)])
+    info, rows = listing_cache.open_cached_listing(path)
+    assert not info.get('from_cache') and list(rows) == [{'POL_NO': 'HS/1'}]
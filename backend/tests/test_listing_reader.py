@@ -0,0 +1,62 @@
+import math
+
+from openpyxl import Workbook
+
+from listing_reader import open_listing, pick_sheet_name
+
+
+def write_workbook(path, rows, sheet_name='Sheet1'):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = sheet_name
+    for number, values in enumerate(rows, 1):
+        for column, value in enumerate(values, 1):
+            if value is not None:
+                worksheet.cell(row=number, column=column, value=value)
+    workbook.save(path)
+    return str(path)
+
+
+def test_blank_rows_between_data_rows_come_back_as_empty_rows(tmp_path):
+    path = write_workbook(tmp_path / 'listing.xlsx', [
+        ('POL_NO', 'NAME'),
+        ('HS/1', 'Anna'),
+        (None, None),
+        ('HS/3', '  '),
+    ])
+    info, rows = open_listing(path)
+    rows = list(rows)
+    assert info['has_rows'] and info['columns'] == ['POL_NO', 'NAME']
+    assert len(rows) == 3 and rows[0] == {'POL_NO': 'HS/1', 'NAME': 'Anna'}
+    # Same row numbers as pandas: the blank row is kept, blank cells read as NaN
+    assert all(math.isnan(value) for value in rows[1].values())
+    assert rows[2]['POL_NO'] == 'HS/3' and math.isnan(rows[2]['NAME'])
+
+
+def test_trailing_blank_rows_are_dropped(tmp_path):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append(['POL_NO', 'NAME'])
+    worksheet.append(['HS/1', 'Anna'])
+    worksheet.cell(row=6, column=1).number_format = '0'  # formatted but empty rows at the end
+    workbook.save(tmp_path / 'listing.xlsx')
+    info, rows = open_listing(str(tmp_path / 'listing.xlsx'))
+    assert [row['POL_NO'] for row in rows] == ['HS/1']
+
+
+def test_leading_blank_rows_still_count(tmp_path):
+    path = write_workbook(tmp_path / 'listing.xlsx', [('POL_NO',), (None,), ('HS/2',)])
+    info, rows = open_listing(path)
+    rows = list(rows)
+    assert info['has_rows'] and len(rows) == 2 and rows[1]['POL_NO'] == 'HS/2'
+
+
+def test_header_only_sheet_has_no_rows(tmp_path):
+    info, rows = open_listing(write_workbook(tmp_path / 'listing.xlsx', [('POL_NO', 'NAME')], sheet_name='Data'))
+    assert info['sheet_name'] == 'Data' and not info['has_rows']
+    assert list(rows) == []
+
+
+def test_preferred_sheet_falls_back_to_the_first():
+    assert pick_sheet_name(['Data', 'Sheet1']) == 'Sheet1'
+    assert pick_sheet_name(['Data', 'Other']) == 'Data'
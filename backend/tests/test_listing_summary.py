@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+import listing_cache
+import listing_summary
+from test_listing_reader import write_workbook
+
+pytest.importorskip('pyarrow')
+
+
+def test_summary_keeps_counts_and_row_values_stay_in_the_sidecar(tmp_path, monkeypatch):
+    monkeypatch.setattr(listing_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(listing_summary, 'CACHE_DIR', str(tmp_path / 'cache'))
+    path = write_workbook(tmp_path / 'listing.xlsx', [
+        ('POL_NO', 'NAME', 'SURNAME', 'TOTAL_PREMIUM'),
+        ('HS/1', 'Anna', 'Smith', 1200.5),
+        (None, 'Ben', 'Jones', 'TBA'),
+        ('HS/3', 'Ravi', None, 950),
+    ])
+    summary = listing_summary.load_summary(path, 'Sheet1', kind='health')
+    assert summary['rows'] == 3 and summary['valid_keys'] == 2 and summary['rejected_rows'] == 1
+    assert summary['null_counts']['SURNAME'] == 1
+    assert summary['premium'] == {'column': 'TOTAL_PREMIUM', 'valid': 2, 'invalid': 1, 'blank': 0}
+    assert not {'keys', 'names', 'rejects'} & summary.keys()
+    with open(listing_summary.summary_path(summary['sha256'], 'Sheet1'), encoding='utf-8') as f:
+        assert json.load(f) == summary
+
+    keys, names = listing_summary.listing_keys_and_names(path, 'Sheet1', 'health', summary['sha256'])
+    assert keys == ['HS/1', 'HS/3'] and names == ['Anna Smith', 'Ravi']
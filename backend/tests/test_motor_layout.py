@@ -0,0 +1,25 @@
+import os
+
+import pandas as pd
+
+import motor_layout
+from motor_records import build_motor_records
+
+
+def motor_record(**columns):
+    row = {'Policy No': 'P/2025-1', 'NIC Number': 'A1234567890123', 'Mobile No': '', **columns}
+    return build_motor_records(pd.DataFrame([row]))[0]
+
+
+def test_letter_path_names_the_letter_after_name_and_policy(tmp_path):
+    record = motor_record(Firstname='Priya', Surname='Ramsamy')
+    path = motor_layout.letter_path(record, str(tmp_path))
+    assert path == os.path.join(str(tmp_path), f"Motor_Renewal_{record.safe_name}_{record.safe_policy}.pdf")
+
+
+def test_letter_path_stays_under_the_windows_path_limit(tmp_path):
+    output_dir = os.path.join(str(tmp_path), 'x' * 120)
+    record = motor_record(Firstname='Priyadarshini' * 8, Surname='Ramsamy' * 8)
+    path = motor_layout.letter_path(record, output_dir)
+    assert len(path) <= 250
+    assert path.endswith(f"_{record.safe_policy}.pdf")
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from motor_qr import build_letterhead_qr_payload, build_mobile_qr_payload, build_qr_payload
+from motor_records import build_motor_records
+
+
+def motor_record(**columns):
+    row = {'Policy No': 'P/2025-1', 'NIC Number': 'A1234567890123', 'Mobile No': '', **columns}
+    return build_motor_records(pd.DataFrame([row]))[0]
+
+
+def test_letterhead_label_follows_the_printer_rules():
+    # Printer_version: initial + surname, else surname, else first name (24 characters max)
+    assert build_letterhead_qr_payload(motor_record(Firstname='Priya', Surname='Ramsamy'))['AdditionalCustomerLabel'] == 'P Ramsamy'
+    assert build_letterhead_qr_payload(motor_record(Surname='Ramsamy'))['AdditionalCustomerLabel'] == 'Ramsamy'
+    assert build_letterhead_qr_payload(motor_record(Firstname='Priyadarshini Lakshmi Devi'))['AdditionalCustomerLabel'] == 'Priyadarshini Lakshmi De'
+    assert build_letterhead_qr_payload(motor_record())['AdditionalCustomerLabel'] == ''
+
+
+def test_letterhead_payload_matches_the_printer_version():
+    record = motor_record(Firstname='Priya', **{'Mobile No': ' 57123456 '})
+    assert build_letterhead_qr_payload(record) == dict(
+        build_qr_payload(record),
+        AdditionalBillNumber='P.2025..1',
+        SetAdditionalMobileNo=True,
+        AdditionalMobileNo='57123456',
+        AdditionalCustomerLabel='Priya',
+        AdditionalPurposeTransaction='NICMotor',
+    )
+
+
+def test_standard_payload_keeps_its_own_label_and_purpose():
+    payload = build_qr_payload(motor_record(Firstname='Priya'))
+    assert payload['AdditionalCustomerLabel'] == ''
+    assert payload['AdditionalPurposeTransaction'] == 'A1234567890123'
+    assert payload['SetAdditionalMobileNo'] is False
+
+
+def test_mobile_payload_always_sends_the_mobile_number():
+    # Hanlde_MobileNum.py: mobile flag set even when blank, purpose is the NIC number
+    payload = build_mobile_qr_payload(motor_record(Firstname='Priya', Surname='Ramsamy'))
+    assert payload['SetAdditionalMobileNo'] is True
+    assert payload['AdditionalMobileNo'] == ''
+    assert payload['AdditionalCustomerLabel'] == 'P Ramsamy'
+    assert payload['AdditionalPurposeTransaction'] == 'A1234567890123'
@@ -0,0 +1,37 @@
+import fitz
+import pytest
+
+from print_file import PrintFile
+
+
+def two_page_letter(c, name, fail_on_page=None):
+    for page in (1, 2):
+        c.saveState()
+        c.drawString(72, 720, f"{name} page {page}")
+        if page == fail_on_page:
+            raise ValueError(f"bad row for {name}")
+        c.restoreState()
+        if page == 1:
+            c.showPage()
+
+
+def test_a_failed_letter_leaves_no_page_or_bookmark(tmp_path):
+    print_file = PrintFile(str(tmp_path / 'print.pdf'))
+    print_file.add_letter('A', two_page_letter, 'Anna')
+    for fail_on_page in (1, 2):
+        with pytest.raises(ValueError):
+            print_file.add_letter('B', two_page_letter, 'Ben', fail_on_page)
+    print_file.add_letter('C', two_page_letter, 'Chloe')
+    assert print_file.save() and print_file.letters == 2
+
+    with fitz.open(print_file.path) as doc:
+        assert [page.get_text().strip() for page in doc] == ['Anna page 1', 'Anna page 2', 'Chloe page 1', 'Chloe page 2']
+        assert doc.get_toc() == [[1, 'A', 1], [1, 'C', 3]]
+
+
+def test_nothing_is_written_without_letters(tmp_path):
+    print_file = PrintFile(str(tmp_path / 'print.pdf'))
+    with pytest.raises(ValueError):
+        print_file.add_letter('B', two_page_letter, 'Ben', 1)
+    assert not print_file.save()
+    assert not (tmp_path / 'print.pdf').exists()
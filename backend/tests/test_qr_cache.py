@@ -0,0 +1,41 @@
+import hashlib
+
+import qr_cache
+from qr_cache import PRODUCTION_QR_URL, QRCache, canonical_payload, payload_hash
+
+STUB_URL = 'http://127.0.0.1:8787/api/v1.0/Common/GetMerchantQR'
+PAYLOAD = {'MerchantId': 153, 'AdditionalBillNumber': 'P.1', 'AdditionalCustomerLabel': 'A Smith'}
+
+
+def test_payload_hash_ignores_key_order():
+    reordered = dict(reversed(list(PAYLOAD.items())))
+    assert payload_hash(PAYLOAD, PRODUCTION_QR_URL) == payload_hash(reordered, PRODUCTION_QR_URL)
+
+
+def test_production_key_is_the_bare_payload_hash():
+    expected = hashlib.sha256(canonical_payload(PAYLOAD).encode('utf-8')).hexdigest()
+    assert payload_hash(PAYLOAD, PRODUCTION_QR_URL) == expected
+
+
+def test_endpoint_is_part_of_the_key():
+    assert payload_hash(PAYLOAD, STUB_URL) != payload_hash(PAYLOAD, PRODUCTION_QR_URL)
+    assert payload_hash(PAYLOAD, STUB_URL) != payload_hash(PAYLOAD, 'http://127.0.0.1:9999/qr')
+
+
+def test_stub_answers_are_not_served_to_production(tmp_path):
+    path = str(tmp_path / 'qr.sqlite3')
+    stub = QRCache(path, endpoint=STUB_URL)
+    stub.put(PAYLOAD, 'STUB-QR')
+    production = QRCache(path, endpoint=PRODUCTION_QR_URL)
+    assert production.get(PAYLOAD) is None
+    assert stub.get(PAYLOAD) == 'STUB-QR'
+    stub.close()
+    production.close()
+
+
+def test_non_production_endpoints_get_their_own_database():
+    production = qr_cache.default_cache_path(PRODUCTION_QR_URL)
+    stub = qr_cache.default_cache_path(STUB_URL)
+    assert production.endswith('qr_cache.sqlite3')
+    assert stub != production
+    assert '127.0.0.1' in stub
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+import requests
+
+import qr_client
+
+
+class FakeSession:
+    """Stands in for requests.Session: raises or returns the queued outcomes in order"""
+
+    def __init__(self, *outcomes, gate=None):
+        self.outcomes = list(outcomes)
+        self.gate = gate
+        self.posts = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        outcome = self.outcomes.pop(0) if self.outcomes else qr_client.QRResponse(200, 'QR')
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(qr_client.qr_cache, 'OFFLINE', False)
+    monkeypatch.setattr(qr_client.qr_cache, 'get_cache', lambda: None)
+    monkeypatch.setattr(qr_client.emvco_qr, 'local_qr', lambda payload: None)
+    monkeypatch.setattr(qr_client.time, 'sleep', lambda seconds: None)
+    return qr_client.QRClient(url='http://qr.test')
+
+
+def test_connect_errors_and_retry_statuses_are_retried(client):
+    client.session = FakeSession(requests.exceptions.ConnectTimeout(), qr_client.QRResponse(503, ''))
+    assert client.post_merchant_qr({}).text == 'QR'
+    assert client.session.posts == 3
+    assert client.retries == 2
+
+
+def test_read_timeout_is_not_retried(client):
+    client.session = FakeSession(requests.exceptions.ReadTimeout())
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.post_merchant_qr({})
+    assert client.session.posts == 1
+    assert client.retries == 0
+
+
+def test_half_open_breaker_lets_a_single_trial_through(client):
+    client._consecutive_failures = qr_client.BREAKER_THRESHOLD
+    client._open_until = qr_client.time.monotonic() - 1  # cooldown over
+    gate = threading.Event()
+    client.session = FakeSession(gate=gate)
+
+    trial = threading.Thread(target=client.post_merchant_qr, args=({},))
+    trial.start()
+    while client.session.posts == 0:
+        pass
+    # While the trial is in flight every other caller still fails fast
+    with pytest.raises(qr_client.CircuitOpenError):
+        client.post_merchant_qr({})
+    gate.set()
+    trial.join()
+
+    assert client.session.posts == 1
+    assert client._open_until == 0.0  # the trial succeeded, so the circuit is closed again
+    assert client.post_merchant_qr({}).text == 'QR'
+
+
+def test_failed_trial_reopens_the_circuit_without_retrying(client):
+    client._consecutive_failures = qr_client.BREAKER_THRESHOLD
+    client._open_until = qr_client.time.monotonic() - 1
+    client.session = FakeSession(requests.exceptions.ConnectionError())
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post_merchant_qr({})
+    assert client.session.posts == 1
+    with pytest.raises(qr_client.CircuitOpenError):
+        client.post_merchant_qr({})
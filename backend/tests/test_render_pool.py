@@ -0,0 +1,17 @@
+import render_pool
+
+
+def print_job(number):
+    # Several print calls per job, like a letter's progress lines
+    print(f"start {number}")
+    print(f"done {number}")
+    return 'generated', number
+
+
+def test_job_output_is_printed_whole_and_in_job_order(capfd):
+    with render_pool.RenderPool(3) as pool:
+        results = list(pool.map(print_job, ((number,) for number in range(20))))
+    assert results == list(range(20))
+    lines = capfd.readouterr().out.splitlines()
+    assert lines == [line for number in range(20) for line in (f"start {number}", f"done {number}")]
+    assert pool.totals() == {'generated': 20}
@@ -0,0 +1,64 @@
+import csv
+import os
+
+import pandas as pd
+
+from motor_records import build_motor_records
+from validation import RejectReport, classify_health_frame, classify_motor_records, health_row_reject, write_reject_report
+
+HEALTH_ROWS = [
+    {'POL_NO': 'HS/1', 'NAME': 'Anna', 'SURNAME': 'Smith'},
+    {'POL_NO': float('nan'), 'NAME': 'Ben', 'SURNAME': 'Jones'},
+    {'POL_NO': 'HS/3', 'NAME': '   ', 'SURNAME': 'Lee'},
+    {'POL_NO': float('nan'), 'NAME': float('nan'), 'SURNAME': float('nan')},
+    {'POL_NO': 1234, 'NAME': 'Dev', 'SURNAME': float('nan')},
+]
+
+
+def test_health_rows_are_rejected_for_missing_policy_or_name():
+    rejects = [health_row_reject(row, number) for number, row in enumerate(HEALTH_ROWS, 1)]
+    assert rejects[0] is None and rejects[4] is None
+    assert rejects[1] == {'row': 2, 'policy_no': '', 'name': 'Ben Jones', 'reasons': ['Missing POL_NO']}
+    assert rejects[2]['reasons'] == ['Missing NAME']
+    assert rejects[3]['reasons'] == ['Missing POL_NO', 'Missing NAME']
+
+
+def test_streamed_rows_and_whole_frame_reject_the_same_rows():
+    streamed = [health_row_reject(row, number) for number, row in enumerate(HEALTH_ROWS, 1)]
+    valid_mask, rejects = classify_health_frame(pd.DataFrame(HEALTH_ROWS))
+    assert rejects == [reject for reject in streamed if reject is not None]
+    assert valid_mask.tolist() == [reject is None for reject in streamed]
+
+
+def test_health_frame_without_the_health_columns_rejects_every_row():
+    valid_mask, rejects = classify_health_frame(pd.DataFrame({'Notes': ['upload guide', 'contact']}))
+    assert valid_mask.tolist() == [False, False]
+    assert [reject['row'] for reject in rejects] == [1, 2]
+    assert rejects[0]['reasons'] == ['Missing POL_NO', 'Missing NAME']
+
+
+def test_motor_records_are_rejected_for_bad_premium_or_cover_end_date():
+    records = build_motor_records(pd.DataFrame([
+        {'Policy No': 'P/1', 'New Net Premium': '1,250.00', 'Cover End Dt': '2025-12-03'},
+        {'Policy No': 'P/2', 'New Net Premium': 'TBA', 'Cover End Dt': '2025-12-03'},
+        {'Policy No': 'P/3', 'New Net Premium': '900', 'Cover End Dt': 'soon'},
+        {'Policy No': 'P/4', 'New Net Premium': '900', 'Cover End Dt': ''},
+    ]))
+    valid, rejects = classify_motor_records(records)
+    assert [record.policy_no for record in valid] == ['P/1', 'P/4']
+    assert [(reject['row'], reject['reasons']) for reject in rejects] == [
+        (2, ["Non-numeric or empty 'New Net Premium' value: 'TBA'"]),
+        (3, ["Could not parse Cover End Dt 'soon'"]),
+    ]
+
+
+def test_reject_report_is_written_as_rows_come_in_and_removed_when_clean(tmp_path):
+    report = RejectReport(str(tmp_path))
+    report.add({'row': 2, 'policy_no': '', 'name': 'Ben Jones', 'reasons': ['Missing POL_NO', 'Missing NAME']})
+    # Readable before the run finishes
+    with open(report.path, newline='', encoding='utf-8') as f:
+        assert list(csv.DictReader(f)) == [{'row': '2', 'policy_no': '', 'name': 'Ben Jones', 'reasons': 'Missing POL_NO; Missing NAME'}]
+    assert report.close() == report.path and report.rejects == 1
+
+    assert write_reject_report([], str(tmp_path)) is None
+    assert not os.path.exists(report.path)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Listing Validation
+Classifies every listing row before any QR API call or PDF work, so rows that
+would be skipped never cost network or render time, and writes the rejected
+rows to a report next to the generated letters
+"""
+
+import csv
+import os
+
+import pandas as pd
+
+REJECT_REPORT_NAME = 'rejected_rows.csv'
+REJECT_REPORT_FIELDS = ['row', 'policy_no', 'name', 'reasons']
+HEALTH_REJECT_COLUMNS = ('POL_NO', 'NAME', 'SURNAME')  # columns health_row_reject reads
+
+
+def text_values(series):
+    """Return a column as stripped strings with NaN/missing values as ''"""
+    cleaned = series.astype(str).str.strip()
+    return cleaned.where(series.notna(), '')
+
+
+def classify_motor_records(records):
+    """Split cleaned MotorRecords into (valid, rejects).
+
+    A record is rejected for a non-numeric or empty 'New Net Premium' or an
+    unparseable 'Cover End Dt' (both flags are computed by normalize_motor_frame).
+    """
+    valid, rejects = [], []
+    for record in records:
+        reasons = []
+        if not record.premium_valid:
+            reasons.append(f"Non-numeric or empty 'New Net Premium' value: '{record.new_net_premium}'")
+        if not record.date_valid:
+            reasons.append(f"Could not parse Cover End Dt '{record.cover_end_dt}'")
+        if reasons:
+            rejects.append({
+                'row': record.row_number,
+                'policy_no': record.policy_no,
+                'name': record.name,
+                'reasons': reasons,
+            })
+        else:
+            valid.append(record)
+    return valid, rejects
+
+
+def row_text(row, column):
+    """Return one cell of a listing row as a stripped string, '' when missing"""
+    value = row.get(column)
+    if value is None or pd.isna(value):
+        return ''
+    return str(value).strip()
+
+
+def health_row_reject(row, row_number):
+    """Reject entry for one health listing row as it streams in, or None when it is valid.
+
+    The health reject rules: a row needs a POL_NO and a NAME.
+    """
+    pol_no, name, surname = (row_text(row, column) for column in HEALTH_REJECT_COLUMNS)
+    reasons = []
+    if not pol_no:
+        reasons.append('Missing POL_NO')
+    if not name:
+        reasons.append('Missing NAME')
+    if not reasons:
+        return None
+    return {
+        'row': row_number,
+        'policy_no': pol_no,
+        'name': f"{name} {surname}".strip(),
+        'reasons': reasons,
+    }
+
+
+def classify_health_frame(df):
+    """Return (valid_mask, rejects) for a health listing DataFrame.
+
+    Applies health_row_reject to every row, so the upload summary rejects
+    exactly the rows the generator skips; row numbers count from 1 in listing order.
+    """
+    columns = [column for column in HEALTH_REJECT_COLUMNS if column in df.columns]
+    # A frame without any of the columns has no records to list, but every row is still rejected
+    rows = df[columns].to_dict('records') if columns else [{}] * len(df)
+    rejects = []
+    valid = []
+    for position, row in enumerate(rows):
+        reject = health_row_reject(row, position + 1)
+        valid.append(reject is None)
+        if reject is not None:
+            rejects.append(reject)
+    return pd.Series(valid, index=df.index, dtype=bool), rejects
+
+
+class RejectReport:
+    """<output_dir>/rejected_rows.csv, written one reject at a time as a listing streams through"""
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, REJECT_REPORT_NAME)
+        self.rejects = 0
+        self._file = None
+        self._writer = None
+
+    def add(self, reject):
+        """Append one reject (the report is created with the first one)"""
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=REJECT_REPORT_FIELDS)
+            self._writer.writeheader()
+        self._writer.writerow(dict(reject, reasons='; '.join(reject['reasons'])))
+        self._file.flush()
+        self.rejects += 1
+
+    def close(self):
+        """Finish the report and return its path.
+
+        A report left over from an earlier run is removed when nothing was rejected.
+        """
+        if self._file is None:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return None
+        self._file.close()
+        return self.path
+
+
+def write_reject_report(rejects, output_dir):
+    """Write rejects to <output_dir>/rejected_rows.csv and return its path (None when there are none)"""
+    report = RejectReport(output_dir)
+    for reject in rejects:
+        report.add(reject)
+    return report.close()
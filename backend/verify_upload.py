@@ -1,16 +1,18 @@
-import pandas as pd
 import os
 
+from listing_summary import listing_keys_and_names, load_summary
+
 # Check the uploaded file
 upload_path = 'uploads/health/RENEWAL_LISTING.xlsx'
 if os.path.exists(upload_path):
-    df = pd.read_excel(upload_path)
-    print(f"UPLOADED FILE: {len(df)} total rows")
-    if 'POL_NO' in df.columns:
-        valid_policies = df['POL_NO'].notna().sum()
+    summary = load_summary(upload_path, kind='health')
+    print(f"UPLOADED FILE: {summary['rows']} total rows")
+    if summary['key_column'] == 'POL_NO':
+        valid_policies = summary['valid_keys']
         print(f"UPLOADED FILE: {valid_policies} valid policy numbers")
         print("First 5 policy numbers:")
-        for pol in df[df['POL_NO'].notna()]['POL_NO'].head(5):
+        keys, _ = listing_keys_and_names(upload_path, kind='health', digest=summary['sha256'])
+        for pol in keys[:5]:
             print(f"  - {pol}")
 else:
     print("UPLOADED FILE: Not found")
@@ -18,10 +20,10 @@ else:
 # Check if there's a file in backend root
 backend_path = 'RENEWAL_LISTING.xlsx'
 if os.path.exists(backend_path):
-    df2 = pd.read_excel(backend_path)
-    print(f"\nBACKEND FILE: {len(df2)} total rows")
-    if 'POL_NO' in df2.columns:
-        valid_policies2 = df2['POL_NO'].notna().sum()
+    summary2 = load_summary(backend_path, kind='health')
+    print(f"\nBACKEND FILE: {summary2['rows']} total rows")
+    if summary2['key_column'] == 'POL_NO':
+        valid_policies2 = summary2['valid_keys']
         print(f"BACKEND FILE: {valid_policies2} valid policy numbers")
 else:
     print("\nBACKEND FILE: Not found")
\ No newline at end of file